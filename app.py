@@ -11,13 +11,20 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from flask import Flask, jsonify
+import click
+from flask import Flask, g, jsonify, request
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 
 from config import get_config
 from models import db
-#from routes import users_bp, invites_bp
+from models.database import instrument_engine, record_queries
+from utils.password_hasher import password_hasher
+from utils.invite_sweeper import invite_sweeper
+from utils.result_cache import result_cache
+from utils.metrics import metrics
+from utils.decorators import require_api_key
+from utils.json_provider import FastJSONProvider
+from routes import users_bp, invites_bp
 
 
 def create_app(config_name=None):
@@ -31,24 +38,41 @@ def create_app(config_name=None):
         Flask: Configured Flask application
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Load configuration
-    config_class = get_config()
+    config_class = get_config(config_name)
     app.config.from_object(config_class)
     
     # Initialize extensions
     db.init_app(app)
+    metrics.init_app(app, db)
     jwt = JWTManager(app)
-    migrate = Migrate(app, db)
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        # Alembic is only needed by `flask db ...`; servers and workers skip its import
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    password_hasher.init_app(app)
+    invite_sweeper.init_app(app)
+    result_cache.init_app(app)
     
     # Register blueprints
-    # Register blueprints
-    #app.register_blueprint(users_bp)
-    #app.register_blueprint(invites_bp)
+    app.register_blueprint(users_bp)
+    app.register_blueprint(invites_bp)
     
     # Register error handlers
     register_error_handlers(app)
     
+    # Register CLI commands
+    register_commands(app)
+    
+    # SQL statement recording (X-Query-Count in development, query budgets in tests)
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+    if app.config.get('QUERY_COUNT_HEADER'):
+        register_query_debugging(app)
+    
     # Health check endpoint
     @app.route('/')
     def index():
@@ -60,7 +84,17 @@ def create_app(config_name=None):
     
     @app.route('/health')
     def health():
-        return jsonify(status=200, message='OK'), 200
+        return jsonify(
+            status=200,
+            message='OK',
+            password_hashing=password_hasher.stats(),
+            result_cache=result_cache.stats()
+        ), 200
+    
+    @app.route('/metrics')
+    @require_api_key
+    def metrics_endpoint():
+        return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
     
     return app
 
@@ -81,11 +115,69 @@ def register_error_handlers(app):
         return jsonify(status=405, message='Method not allowed'), 405
 
 
-# Create the application instance
-app = create_app()
+def register_query_debugging(app):
+    """Report the statements of each request in X-Query-Count and warn on N+1 patterns."""
+    threshold = app.config.get('QUERY_REPEAT_THRESHOLD', 3)
+    
+    @app.before_request
+    def start_query_log():
+        g.query_recorder = record_queries()
+        g.query_log = g.query_recorder.__enter__()
+    
+    @app.after_request
+    def add_query_count(response):
+        log = g.get('query_log')
+        if log is None:
+            return response
+        response.headers['X-Query-Count'] = str(len(log))
+        repeated = log.repeated(threshold)
+        if repeated:
+            response.headers['X-Query-Repeated'] = str(len(repeated))
+            for shape, count in repeated:
+                app.logger.warning('Possible N+1 in %s: %d x %s', request.endpoint, count, shape)
+        return response
+    
+    @app.teardown_request
+    def stop_query_log(exc):
+        recorder = g.pop('query_recorder', None)
+        if recorder is not None:
+            recorder.__exit__(None, None, None)
+
+
+def register_commands(app):
+    """Register custom CLI commands."""
+    
+    @app.cli.command('rebuild-org-paths')
+    def rebuild_org_paths_command():
+        """Recompute the materialized org_path of every user."""
+        from models.org_tree import rebuild_org_paths
+        count = rebuild_org_paths()
+        click.echo(f'Rebuilt org_path for {count} users')
+    
+    @app.cli.command('sweep-invites')
+    @click.option('--batch-size', default=None, type=int, help='Codes per UPDATE batch.')
+    def sweep_invites_command(batch_size):
+        """Deactivate expired and used-up invite codes."""
+        from utils.invite_sweeper import sweep_invites
+        count = sweep_invites(batch_size or app.config['INVITE_SWEEP_BATCH_SIZE'])
+        click.echo(f'Deactivated {count} invite codes')
+
+
+def __getattr__(name):
+    # `from app import app` and `flask run` build the default instance on first
+    # access rather than at import, so importing create_app stays cheap
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 if __name__ == '__main__':
     # Run the development server
+    app = create_app()
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # Only the reloader's serving child sweeps, not the watcher
+        invite_sweeper.start()
     app.run(host='0.0.0.0' ,port=5001, debug=True)
     
@@ -15,6 +15,26 @@ class authHelper :
             return False
         
     
+    def CreateUserWithId(self,Email,password):
+        """Create the auth account and return (success, auth user id)"""
+        try:
+            result = self.authenticater.createUser(Email,password)
+            if result is None:
+                return False, None
+            user = getattr(result, 'user', None)
+            return True, getattr(user, 'id', None)
+        except Exception as e:
+            print(f"Auth creation error: {e}")
+            return False, None
+
+    def DeleteUser(self,userId) -> bool:
+        try:
+            self.authenticater.deleteUser(userId)
+            return True
+        except Exception as e:
+            print(f"Auth delete error: {e}")
+            return False
+
     def login (self,Email,password) -> bool:
         try:
             result = self.authenticater.login(Email,password)
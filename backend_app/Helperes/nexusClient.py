@@ -0,0 +1,116 @@
+import os
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class nexusClient:
+    """Shared, connection-pooled HTTP client for the Nexus Data Service.
+
+    Every call goes through one keep-alive ``requests.Session`` so TCP
+    connections are reused between requests. Idempotent calls are retried
+    with exponential backoff on connection errors and 502/503/504; POST is
+    never retried so creates cannot be duplicated.
+
+    ``getJson`` revalidates reads with If-None-Match: the last body seen for
+    each URL is kept with its ETag, and a 304 reply reuses it instead of
+    downloading and parsing the payload again.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    RETRY_STATUSES = (502, 503, 504)
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, baseUrl=None, apiKey=None, poolSize=None,
+                 connectTimeout=None, readTimeout=None, retries=None, backoff=None,
+                 etagCacheSize=None):
+        self.baseUrl = (baseUrl or os.getenv("NEXUS_API_URL", "http://127.0.0.1:5001")).rstrip("/")
+        self.apiKey = apiKey or os.getenv("INTERNAL_API_KEY", "nexus-internal-secret-key-123")
+        poolSize = poolSize if poolSize is not None else int(os.getenv("NEXUS_POOL_SIZE", "20"))
+        connectTimeout = connectTimeout if connectTimeout is not None else float(os.getenv("NEXUS_CONNECT_TIMEOUT", "3"))
+        readTimeout = readTimeout if readTimeout is not None else float(os.getenv("NEXUS_READ_TIMEOUT", "10"))
+        retries = retries if retries is not None else int(os.getenv("NEXUS_MAX_RETRIES", "3"))
+        backoff = backoff if backoff is not None else float(os.getenv("NEXUS_RETRY_BACKOFF", "0.2"))
+
+        self.poolSize = poolSize
+        self.retries = retries
+        self.timeout = (connectTimeout, readTimeout)
+        self.etagCacheSize = etagCacheSize if etagCacheSize is not None else int(os.getenv("NEXUS_ETAG_CACHE_SIZE", "256"))
+        self._etagCache = OrderedDict()
+        self._etagLock = threading.Lock()
+        self.notModified = 0
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({"X-Internal-Key": self.apiKey})
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide client, creating it on first use."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.baseUrl}{path}", **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def getJson(self, path, params=None):
+        """Conditional GET. Returns ``(status_code, parsed_body)``; a 304 is
+        reported as 200 with the cached body."""
+        key = (path, tuple(sorted((params or {}).items())))
+        with self._etagLock:
+            cached = self._etagCache.get(key)
+
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = self.get(path, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            with self._etagLock:
+                self.notModified += 1
+                if key in self._etagCache:
+                    self._etagCache.move_to_end(key)
+            return 200, cached[1]
+
+        body = response.json()
+        etag = response.headers.get("ETag")
+        with self._etagLock:
+            if response.status_code == 200 and etag and self.etagCacheSize > 0:
+                self._etagCache[key] = (etag, body)
+                self._etagCache.move_to_end(key)
+                while len(self._etagCache) > self.etagCacheSize:
+                    self._etagCache.popitem(last=False)
+            else:
+                self._etagCache.pop(key, None)
+        return response.status_code, body
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -18,7 +18,7 @@ class passwordHelper:
 
     @staticmethod
     def assignPasswordToUser(userId, password):
-        jsonPass= JsonUserPasswordStore("./passJson.json")
+        jsonPass= JsonUserPasswordStore.shared("./passJson.json")
         encryptedPassword = passwordHelper.EncrpytingPassword(password)
         ##SecuirityClass = passwordSecurity(encryptedPassword, userId)
         jsonPass.set_password(userId, encryptedPassword)
@@ -36,7 +36,7 @@ class passwordHelper:
     @staticmethod
     def getPasswordForUser(userid):
         #get hashed password from db by user id
-        json_user_password_store = JsonUserPasswordStore("./passJson.json")
+        json_user_password_store = JsonUserPasswordStore.shared("./passJson.json")
         hashedPassword = json_user_password_store.get_password(userid)
         # Replace with actual retrieval logic
         return hashedPassword
\ No newline at end of file
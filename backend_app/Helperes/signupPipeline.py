@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from modeles.user import User
+from Helperes.nexusClient import nexusClient
+from Helperes.userCache import identityCache
+from Helperes.userHelper import userHelper
+
+
+class signupPipeline:
+    """Signup that overlaps the independent network calls.
+
+    The Supabase auth account, the Nexus profile and the invite lookup are
+    started together, so latency tracks the slowest of them instead of the
+    sum. If only one of auth/profile succeeds, the other is rolled back.
+    Coroutines run on one background event loop shared by all request
+    threads, which keeps the async Nexus client's connections alive.
+    """
+
+    _loop = None
+    _client = None
+    _lock = threading.Lock()
+
+    def __init__(self, auth):
+        self.auth = auth
+
+    def signUp(self, Email, FirstName, LastName, DateOfBirth, Address, password, managerCode=None):
+        """Returns (success, User, failedStep) where failedStep is 'auth' or 'profile'."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._signUp(Email, FirstName, LastName, DateOfBirth, Address, password, managerCode),
+            signupPipeline._eventLoop()
+        )
+        return future.result()
+
+    async def _signUp(self, Email, FirstName, LastName, DateOfBirth, Address, password, managerCode):
+        client = signupPipeline._nexus()
+        payload = {
+            "email": Email,
+            "first_name": FirstName,
+            "last_name": LastName,
+            "date_of_birth": DateOfBirth,
+            "address": Address,
+            "password": password,
+            "role": "employee"
+        }
+
+        inviteTask = asyncio.create_task(self._resolveInvite(client, managerCode)) if managerCode else None
+        (authOk, authId), profile = await asyncio.gather(
+            asyncio.to_thread(self.auth.CreateUserWithId, Email, password),
+            self._createProfile(client, payload)
+        )
+        identityCache.invalidate(Email)
+
+        if not authOk or profile is None:
+            if inviteTask:
+                inviteTask.cancel()
+            # Compensate whichever branch did succeed; a failed rollback is
+            # logged and the signup still reports the original failure
+            if authOk:
+                await self._deleteAuth(Email, authId)
+            if profile is not None:
+                await self._deleteProfile(client, profile['id'])
+            return False, None, 'auth' if not authOk else 'profile'
+
+        if inviteTask:
+            managerId = await inviteTask
+            if managerId:
+                try:
+                    response = await client.put(f"/users/{profile['id']}", json={"manager_id": managerId})
+                    if response.status_code == 200:
+                        profile = response.json()['data']
+                except Exception as e:
+                    print(f"Add employer to manager error: {e}")
+
+        return True, User.from_dict(userHelper._map_nexus_to_backend(profile)), None
+
+    async def _createProfile(self, client, payload):
+        try:
+            response = await client.post("/users/", json=payload)
+            if response.status_code == 201:
+                return response.json()['data']
+            print(f"API Error: {response.text}")
+        except Exception as e:
+            print(f"Create user error: {e}")
+        return None
+
+    async def _deleteAuth(self, Email, authId):
+        try:
+            deleted = bool(authId) and await asyncio.to_thread(self.auth.DeleteUser, authId)
+        except Exception as e:
+            print(f"Auth rollback error: {e}")
+            deleted = False
+        if not deleted:
+            print(f"Auth rollback failed: account {authId} for {Email} left behind")
+
+    async def _deleteProfile(self, client, userId):
+        try:
+            response = await client.delete(f"/users/{userId}")
+            if response.status_code != 200:
+                print(f"Profile rollback failed: {response.text}")
+        except Exception as e:
+            print(f"Profile rollback error: {e}")
+
+    async def _resolveInvite(self, client, code):
+        try:
+            response = await client.get(f"/invites/{code}", params={"active": "true"})
+            if response.status_code == 200:
+                data = response.json()['data']
+                if data['is_active']:
+                    return data['manager_id']
+        except Exception as e:
+            print(f"Get manager from code error: {e}")
+        return None
+
+    @classmethod
+    def _eventLoop(cls):
+        if cls._loop is None:
+            with cls._lock:
+                if cls._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="signup-loop", daemon=True).start()
+                    cls._loop = loop
+        return cls._loop
+
+    @classmethod
+    def _nexus(cls):
+        # Only touched from the event loop thread
+        if cls._client is None:
+            import httpx  # deferred: only signups need the async client
+
+            sync = nexusClient.shared()
+            cls._client = httpx.AsyncClient(
+                base_url=sync.baseUrl,
+                headers={"X-Internal-Key": sync.apiKey},
+                timeout=httpx.Timeout(sync.timeout[1], connect=sync.timeout[0]),
+                transport=httpx.AsyncHTTPTransport(
+                    retries=sync.retries,  # connection failures only
+                    limits=httpx.Limits(max_connections=sync.poolSize)
+                )
+            )
+        return cls._client
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from functools import wraps
+from flask import jsonify
+from flask_jwt_extended import get_jwt, jwt_required
+from Helperes.nexusClient import nexusClient
+from Helperes.userCache import identityCache
+
+
+class tokenVersions:
+    """Per-user token version stamps mirrored from Nexus.
+
+    Nexus bumps a user's version when their role or email changes or their
+    tokens are revoked, and only lists users with a non-zero version, so the
+    table stays small. It is refreshed at most every ``ttl`` seconds with a
+    conditional GET (a 304 when nothing changed); lookups in between are a
+    dict read. While one thread refreshes, the others keep using the last
+    table, except before the first load, when they all wait for it.
+
+    A failed refresh keeps the last table and is retried after
+    ``retryAfter`` seconds rather than a full ``ttl``. The table is only
+    trusted for ``maxStaleness`` seconds after the last successful refresh
+    (TOKEN_VERSION_MAX_STALENESS, 4 x ttl by default): past that, or before
+    any load succeeded, ``isFresh`` is False and tokenClaims rejects every
+    token, since a revocation may have been missed. 0 disables the limit
+    and keeps the last table for as long as Nexus is unreachable.
+    """
+
+    def __init__(self, ttl=None, maxStaleness=None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("TOKEN_VERSION_TTL", "15"))
+        self.maxStaleness = maxStaleness if maxStaleness is not None else float(os.getenv("TOKEN_VERSION_MAX_STALENESS", str(4 * self.ttl)))
+        self.retryAfter = min(self.ttl, 1.0)
+        self._versions = {}
+        self._expires = 0.0
+        self._loadedAt = None
+        self._lock = threading.Lock()
+
+    def current(self, userId):
+        self._refresh()
+        return self._versions.get(userId, 0)
+
+    def isStale(self, userId, version):
+        return version < self.current(userId)
+
+    def isFresh(self):
+        """True while the table is recent enough to trust"""
+        if self.maxStaleness <= 0:
+            return True
+        return self._loadedAt is not None and time.monotonic() - self._loadedAt <= self.maxStaleness
+
+    def invalidate(self):
+        """Force a refresh on the next lookup"""
+        self._expires = 0.0
+
+    def _refresh(self):
+        if self._expires > time.monotonic():
+            return
+        # Nothing to fall back on before the first load, so wait for it
+        if not self._lock.acquire(blocking=self._loadedAt is None):
+            return
+        try:
+            if self._expires > time.monotonic():
+                # Loaded (or failed) while we waited for the lock
+                return
+            status, body = nexusClient.shared().getJson("/users/token-versions")
+            if status != 200:
+                raise RuntimeError(f"status {status}")
+            versions = {int(userId): version for userId, version in body['data'].items()}
+            if versions != self._versions:
+                # Someone's role or email changed; drop cached users so new tokens see it
+                identityCache.clear()
+                self._versions = versions
+            self._loadedAt = time.monotonic()
+            self._expires = self._loadedAt + self.ttl
+        except Exception as e:
+            # Keep the last table; isFresh turns False once it is too old
+            print(f"Token versions refresh error: {e}")
+            self._expires = time.monotonic() + self.retryAfter
+        finally:
+            self._lock.release()
+
+
+# Process-wide table used by tokenClaims
+versionTable = tokenVersions()
+
+
+class tokenClaims:
+    """Role, Nexus user id and version stamp carried in access tokens, so
+    protected routes authorize without fetching the user from Nexus."""
+
+    @staticmethod
+    def forUser(user):
+        return {
+            "role": user.getRole().value,
+            "uid": user.getId(),
+            "ver": versionTable.current(user.getId()),
+        }
+
+    @staticmethod
+    def isRevoked(payload):
+        # Tokens issued before claims existed carry no uid; make them log in again
+        if "uid" not in payload:
+            return True
+        if versionTable.isStale(payload["uid"], payload.get("ver", 0)):
+            return True
+        # Fail closed: a table Nexus has not confirmed for too long may miss revocations
+        return not versionTable.isFresh()
+
+    @staticmethod
+    def roleRequired(*roles):
+        """``@jwt_required()`` plus a role check on the token's claims"""
+        allowed = {role.value for role in roles}
+
+        def decorator(fn):
+            @wraps(fn)
+            @jwt_required()
+            def wrapper(*args, **kwargs):
+                if get_jwt().get("role") not in allowed:
+                    return jsonify({"Text": "not authorized"}), 401
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
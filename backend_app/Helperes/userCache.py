@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class userCache:
+    """Bounded in-process TTL/LRU cache of backend User objects keyed by email.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``maxSize`` is reached. Writers must call ``invalidate`` for
+    every email they change so readers never see stale roles. Invalidation
+    only reaches this process, so serve.py disables the cache when it runs
+    more than one worker.
+    """
+
+    def __init__(self, ttl=None, maxSize=None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("USER_CACHE_TTL", "60"))
+        self.maxSize = maxSize if maxSize is not None else int(os.getenv("USER_CACHE_SIZE", "1024"))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, email, user):
+        if self.maxSize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *emails):
+        with self._lock:
+            for email in emails:
+                self._entries.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def disable(self):
+        """Stop caching; used when other processes write without telling this one"""
+        self.ttl = 0
+        self.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxSize": self.maxSize,
+                "ttl": self.ttl,
+            }
+
+
+# Process-wide cache used by userHelper
+identityCache = userCache()
@@ -1,27 +1,34 @@
-import requests
 import uuid
+from urllib.parse import quote
 from modeles.user import User
 from modeles.role import ROLE
 from Helperes.passwordHelper import passwordHelper
+from Helperes.nexusClient import nexusClient
+from Helperes.userCache import identityCache
 
-# Configuration for Nexus Data Service
-NEXUS_API_URL = "http://127.0.0.1:5001"
-INTERNAL_API_KEY = "nexus-internal-secret-key-123"
-HEADERS = {"X-Internal-Key": INTERNAL_API_KEY}
+# Nexus stores roles as lowercase strings; the backend works with ROLE
+NEXUS_ROLES = {
+    "employee": ROLE.EMPLOYER,
+    "manager": ROLE.MANAGER,
+    "hr": ROLE.HR,
+    "admin": ROLE.ADMIN,
+}
 
 class userHelper:
 
     @staticmethod
     def getUserByEmail(email: str) -> User:
         try:
-            # Fetch all users and filter (inefficient but matches previous logic)
-            # Better: Fetch specific user if API supports it
-            response = requests.get(f"{NEXUS_API_URL}/users/", headers=HEADERS)
-            if response.status_code == 200:
-                users_data = response.json()['data']
-                for u_data in users_data:
-                    if u_data.get('email') == email:
-                        return User.from_dict(userHelper._map_nexus_to_backend(u_data))
+            cached = identityCache.get(email)
+            if cached is not None:
+                return cached
+            # Single indexed lookup on Nexus instead of downloading every user
+            status, body = nexusClient.shared().getJson(f"/users/by-email/{quote(email, safe='')}")
+            if status == 200:
+                u_data = body['data']
+                user = User.from_dict(userHelper._map_nexus_to_backend(u_data))
+                identityCache.set(email, user)
+                return user
             return None
         except Exception as e:
             print(f"Error getting user: {e}")
@@ -40,7 +47,8 @@ class userHelper:
                 "role": "employee" # Default role
             }
             
-            response = requests.post(f"{NEXUS_API_URL}/users/", json=payload, headers=HEADERS)
+            response = nexusClient.shared().post("/users/", json=payload)
+            identityCache.invalidate(Email)
             
             if response.status_code == 201:
                 user_data = response.json()['data']
@@ -56,17 +64,16 @@ class userHelper:
     @staticmethod
     def getAllUsers(type=None):
         try:
-            response = requests.get(f"{NEXUS_API_URL}/users/", headers=HEADERS)
-            if response.status_code == 200:
-                users_data = response.json()['data']
-                users = [User.from_dict(userHelper._map_nexus_to_backend(u)) for u in users_data]
-                
-                if type is not None:
-                    # Filter by role (Nexus uses lowercase strings, Backend uses Enum or string?)
-                    # Assuming Backend ROLE enum values match or we need to map
-                    target_role = type.value if hasattr(type, 'value') else type
-                    users = [u for u in users if u.Role == target_role]
-                return users
+            params = None
+            if type is not None:
+                # Let Nexus filter by role instead of downloading everyone
+                role = type if isinstance(type, ROLE) else ROLE(type)
+                params = {"role": userHelper._nexus_role(role)}
+
+            # Revalidated with If-None-Match; an unchanged list costs a 304
+            status, body = nexusClient.shared().getJson("/users/", params=params)
+            if status == 200:
+                return [User.from_dict(userHelper._map_nexus_to_backend(u)) for u in body['data']]
             return []
         except Exception as e:
             print(f"Get all users error: {e}")
@@ -86,14 +93,15 @@ class userHelper:
                 "code": code,
                 "max_uses": 1 # Default to 1 use?
             }
-            requests.post(f"{NEXUS_API_URL}/invites/", json=payload, headers=HEADERS)
+            nexusClient.shared().post("/invites/", json=payload)
+            identityCache.invalidate(manager.Email)
         except Exception as e:
             print(f"Assign code error: {e}")
     
     @staticmethod
     def getManagerFromCode(code):
         try:
-            response = requests.get(f"{NEXUS_API_URL}/invites/{code}", headers=HEADERS)
+            response = nexusClient.shared().get(f"/invites/{code}", params={"active": "true"})
             if response.status_code == 200:
                 data = response.json()['data']
                 if data['is_active']:
@@ -108,7 +116,7 @@ class userHelper:
                     
                     # Fetch manager details
                     manager_id = data['manager_id']
-                    manager_res = requests.get(f"{NEXUS_API_URL}/users/{manager_id}", headers=HEADERS)
+                    manager_res = nexusClient.shared().get(f"/users/{manager_id}")
                     if manager_res.status_code == 200:
                         return manager_res.json()['data']['email']
             return None
@@ -137,12 +145,18 @@ class userHelper:
             # We should probably use Nexus ID as the ID in Backend User object now.
             
             payload = {"manager_id": target_manager.ID}
-            requests.put(f"{NEXUS_API_URL}/users/{target_user.ID}", json=payload, headers=HEADERS)
+            nexusClient.shared().put(f"/users/{target_user.ID}", json=payload)
+            identityCache.invalidate(user.Email, manager.Email)
             return True
         except Exception as e:
             print(f"Add employer to manager error: {e}")
             return False
 
+    @staticmethod
+    def cacheStats():
+        """Hit/miss counters of the identity cache"""
+        return identityCache.stats()
+
     @staticmethod
     def _map_nexus_to_backend(nexus_data):
         """Helper to map Nexus API response to Backend User dict format"""
@@ -156,7 +170,15 @@ class userHelper:
             "ID": nexus_data.get('id'), # Using Nexus Int ID
             "DateOfBirth": nexus_data.get('date_of_birth'),
             "Address": nexus_data.get('address'),
-            "Role": nexus_data.get('role'), # String match?
+            "Role": NEXUS_ROLES.get(nexus_data.get('role'), ROLE.GUEST),
             "Department": nexus_data.get('department'),
             "EmployeesList": [] # Nexus doesn't return this list directly in user object usually
         }
+
+    @staticmethod
+    def _nexus_role(role: ROLE):
+        """Nexus role string for a backend ROLE"""
+        for nexusRole, backendRole in NEXUS_ROLES.items():
+            if backendRole == role:
+                return nexusRole
+        return role.value.lower()
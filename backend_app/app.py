@@ -2,12 +2,14 @@ from flask import Flask, jsonify, render_template, session, send_from_directory,
 from dotenv import load_dotenv
 from Helperes.userHelper import userHelper
 from Helperes.passwordHelper import passwordHelper
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import JWTManager, create_access_token
 from modeles.role import ROLE
-from testStore.userJson import JsonUserStore
+from testStore.userStore import openUserStore
 from supaBase.supaBase import dataBaseAuth
 from werkzeug.serving import WSGIRequestHandler
 from Helperes.authHelper import authHelper
+from Helperes.signupPipeline import signupPipeline
+from Helperes.tokenClaims import tokenClaims
 import os
 import secrets
 import string
@@ -19,6 +21,14 @@ app.config["JWT_SECRET_KEY"] = "1358415380351515"  # Change this in production
 jwt = JWTManager(app)
 authenter = dataBaseAuth(os.getenv("SUPABASE_URL"),os.getenv("SUPABASE_KEY"))
 auth_helper = authHelper(authenter)
+# Local user/manager-code store: USER_STORE_BACKEND=json (default) or sqlite
+userStore = openUserStore()
+signup_pipeline = signupPipeline(auth_helper)
+
+@jwt.token_in_blocklist_loader
+def isTokenRevoked(jwt_header, jwt_payload):
+    # Version stamp against a cached table, not a Nexus call per request
+    return tokenClaims.isRevoked(jwt_payload)
 
 class CustomRequestHandler(WSGIRequestHandler):
     def setup(self):
@@ -26,11 +36,8 @@ class CustomRequestHandler(WSGIRequestHandler):
         super().setup()
 
 @app.route('/getCodeForManager',methods=['GET'])
-@jwt_required()
+@tokenClaims.roleRequired(ROLE.HR)
 def getCode():
-    current_employer = userHelper.getUserByEmail(get_jwt_identity())
-    if current_employer is None or current_employer.getRole() != ROLE.HR:
-        return jsonify({"Text": "not authorized"}), 401
     data = request.get_json()
     managerMail=data.get('managermail')
     user = userHelper.getUserByEmail(managerMail)
@@ -63,7 +70,7 @@ def login():
             return jsonify({"Text": "user not found"}), 404
         
         if passwordHelper.isPasswordTrueForUser(user.getId(), password) and auth_helper.login(email,password):
-            access_token = create_access_token(identity=email)
+            access_token = create_access_token(identity=email, additional_claims=tokenClaims.forUser(user))
             return jsonify({"accessToken": f"{access_token}"}), 200
         else:
             return jsonify({"Text": "coordinates are wrong"}), 400
@@ -90,28 +97,19 @@ def signUp():
         return jsonify({"Text": "Missing required fields"}), 400
     
     try:
-        # First, create user in Supabase Auth
-        if not auth_helper.CreateUser(email, Password):
-            return jsonify({"Text": "Failed to create authentication account"}), 500
-        
-        # Then, create user locally
-        success, new_user = userHelper.CreateUser(email, firstName, lastName, DateOfBirth, address, Password)
+        # Auth account, Nexus profile and invite lookup run concurrently
+        success, new_user, failedStep = signup_pipeline.signUp(
+            email, firstName, lastName, DateOfBirth, address, Password, ManagerCode
+        )
         
         if success and new_user:
-            access_token = create_access_token(identity=email)
-            
-            # If manager code provided, link to manager
-            if ManagerCode:
-                managerMail = userHelper.getManagerFromCode(ManagerCode)
-                if managerMail:
-                    manager = userHelper.getUserByEmail(managerMail)
-                    if manager:
-                        userHelper.addemployerTomanager(manager, new_user)
-            
+            access_token = create_access_token(identity=email, additional_claims=tokenClaims.forUser(new_user))
             return jsonify({
                 "accessToken": access_token,
                 "message": "User created successfully"
             }), 200
+        elif failedStep == 'auth':
+            return jsonify({"Text": "Failed to create authentication account"}), 500
         else:
             return jsonify({"Text": "Failed to create user profile"}), 500
             
@@ -123,11 +121,8 @@ def signUp():
 
 
 @app.route('/hr/getallemp', methods=['GET'])
-@jwt_required()
+@tokenClaims.roleRequired(ROLE.HR)
 def getAllEmp():
-    current_employer = userHelper.getUserByEmail(get_jwt_identity())
-    if current_employer is None or current_employer.getRole() != ROLE.HR:
-        return jsonify({"Text": "not authorized"}), 401
     employeresList = userHelper.getAllUsers(ROLE.EMPLOYER)
     # Convert each User object to a dictionary for JSON serialization
     employeresList_dicts = [user.to_dict() for user in employeresList]
@@ -135,11 +130,8 @@ def getAllEmp():
 
 
 @app.route('/hr/getallang', methods=['GET'])
-@jwt_required()
+@tokenClaims.roleRequired(ROLE.HR)
 def getAllAng():
-    current_employer = userHelper.getUserByEmail(get_jwt_identity())
-    if current_employer is None or current_employer.getRole() != ROLE.HR:
-        return jsonify({"Text": "not authorized"}), 401
     employeresList = userHelper.getAllUsers(ROLE.MANAGER)
     # Convert each User object to a dictionary for JSON serialization
     employeresList_dicts = [user.to_dict() for user in employeresList]
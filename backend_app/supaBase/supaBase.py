@@ -1,25 +1,57 @@
 import os
-from supabase import create_client, Client ,ClientOptions
-import httpx
+import threading
+
+
+def create_client(url, key, options=None):
+    # supabase pulls in postgrest, storage, realtime and httpx (~0.4s);
+    # only import it when the first auth call needs a client
+    from supabase import create_client as _create_client
+    return _create_client(url, key, options)
+
 
 class dataBaseAuth :
-    def __init__(self, url,key):
-    
+    """Supabase auth wrapper. The client is built on first use, not at import."""
+
+    def __init__(self, url=None, key=None):
+        self.url = url
+        self.key = key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def supabase(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._connect()
+        return self._client
+
+    def _connect(self):
+        import httpx
+        from supabase import ClientOptions
+
         timeout = httpx.Timeout(100.0, connect=100.0)  # 30s timeout, 10s connect
         http_client = httpx.Client(timeout=timeout)
         options = ClientOptions({
             'auth': {'http_client': http_client}
         })
-        self.supabase: Client = create_client(url, key,options)
-    
+        # Environment is read here so .env can be loaded after construction
+        url = self.url or os.getenv("SUPABASE_URL")
+        key = self.key or os.getenv("SUPABASE_KEY")
+        return create_client(url, key,options)
+
     def createUser(self, email,password):
         return self.supabase.auth.sign_up(
     {
         "email": f"{email}",
         "password": f"{password}",
     })
-        
-    
+
+
+
+    def deleteUser(self, user_id):
+        # Needs a service-role key; used to roll back a half-finished signup
+        return self.supabase.auth.admin.delete_user(user_id)
 
     def login(self,email,password):
         return self.supabase.auth.sign_in_with_password(
@@ -29,5 +61,5 @@ class dataBaseAuth :
         }
 )
 
-        
-    
+
+
@@ -1,33 +1,170 @@
 import json
+import os
+import tempfile
+import threading
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, in-process lock still applies
+    fcntl = None
+
+
 class JsonUserPasswordStore:
-    def __init__(self, filepath: str):
+    """Password hash store backed by a JSON snapshot plus an append-only log.
+
+    The parsed map is kept in memory and only reloaded when the snapshot or
+    log file changes on disk (mtime/size), so lookups never touch the file.
+    A reload reads snapshot and log under a shared lock, so it cannot pair
+    an old snapshot with a log another process just compacted away.
+    ``set_password`` appends one JSON line to ``<filepath>.log``; once the
+    log holds ``compact_every`` entries it is folded into a new snapshot
+    written to a temp file and atomically renamed over the old one.
+
+    Use ``JsonUserPasswordStore.shared(path)`` to get the process-wide instance.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, filepath: str, compact_every: int = 500):
         self.filepath = filepath
-        self._ensure_file()
+        self.logpath = filepath + '.log'
+        self.lockpath = filepath + '.lock'
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._data = {}
+        self._log_entries = 0
+        self._signature = None
+        with self._file_lock():
+            self._ensure_file()
+            self._reload()
+
+    @classmethod
+    def shared(cls, filepath: str) -> 'JsonUserPasswordStore':
+        """Return the process-wide store for this file."""
+        key = os.path.abspath(filepath)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls._instances[key] = cls(filepath)
+            return store
 
     def _ensure_file(self):
         try:
             with open(self.filepath, 'r') as f:
                 json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            with open(self.filepath, 'w') as f:
-                json.dump({}, f)
+            self._write_snapshot({})
 
     def set_password(self, userid: str, hashed_password: str):
-        data = self._read()
-        data[userid] = hashed_password
-        self._write(data)
+        userid = str(userid)
+        line = json.dumps({'id': userid, 'hash': hashed_password}) + '\n'
+        with self._lock, self._file_lock():
+            self._refresh()
+            with open(self.logpath, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._data[userid] = hashed_password
+            self._log_entries += 1
+            if self._log_entries >= self.compact_every:
+                self._compact()
+            self._signature = self._stat()
 
     def get_password(self, userid: str) -> Optional[str]:
+        with self._lock:
+            if self._stat() != self._signature:
+                with self._file_lock(shared=True):
+                    self._reload()
+            return self._data.get(str(userid))
+
+    def compact(self):
+        """Fold the log into a fresh snapshot."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._compact()
+            self._signature = self._stat()
+
+    def _refresh(self):
+        # Caller holds the file lock
+        if self._stat() != self._signature:
+            self._reload()
+
+    def _reload(self):
+        signature = self._stat()
         data = self._read()
-        return data.get(userid)
+        entries = 0
+        try:
+            with open(self.logpath, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn trailing write
+                    data[entry['id']] = entry['hash']
+                    entries += 1
+        except FileNotFoundError:
+            pass
+        self._data = data
+        self._log_entries = entries
+        self._signature = signature
+
+    def _compact(self):
+        self._write_snapshot(self._data)
+        with open(self.logpath, 'w'):
+            pass
+        self._log_entries = 0
+
+    def _stat(self):
+        signature = []
+        for path in (self.filepath, self.logpath):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
 
     def _read(self):
         with open(self.filepath, 'r') as f:
-            return json.load(f)
+            return {str(k): v for k, v in json.load(f).items()}
+
+    def _write_snapshot(self, data):
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.passJson-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filepath)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _file_lock(self, shared=False):
+        return _FileLock(self.lockpath, shared)
+
+
+class _FileLock:
+    """Advisory lock shared by all processes using the store: exclusive for
+    writers, shared for readers reloading snapshot and log together."""
+
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared
+        self._f = None
 
-    def _write(self, data):
-        with open(self.filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+    def __enter__(self):
+        if fcntl is not None:
+            self._f = open(self.path, 'a')
+            fcntl.flock(self._f, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
 
+    def __exit__(self, *exc):
+        if self._f is not None:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+            self._f.close()
+            self._f = None
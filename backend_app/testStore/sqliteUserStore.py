@@ -0,0 +1,154 @@
+import json
+import sqlite3
+import threading
+from typing import Optional, List
+from modeles.user import User
+from modeles.department import Department
+from modeles.role import ROLE
+
+
+class SqliteUserStore:
+    """Drop-in replacement for JsonUserStore backed by SQLite in WAL mode.
+
+    Users and manager codes live in separate tables, with secondary indexes
+    on Email and Role, so point lookups are B-tree seeks and writes touch a
+    single row instead of rewriting the whole document. Each thread gets
+    its own connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            ID            TEXT PRIMARY KEY,
+            FirstName     TEXT,
+            LastName      TEXT,
+            DateOfBirth   TEXT,
+            Email         TEXT,
+            Address       TEXT,
+            EmployeesList TEXT NOT NULL DEFAULT '[]',
+            Department    TEXT,
+            Role          TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_users_email ON users (Email);
+        CREATE INDEX IF NOT EXISTS ix_users_role ON users (Role);
+        CREATE TABLE IF NOT EXISTS manager_codes (
+            Email TEXT PRIMARY KEY,
+            Code  TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._local = threading.local()
+        self._ensure_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.filepath, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self):
+        with self._conn() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def add_user(self, user: User):
+        """Add or update a user in the store"""
+        row = self._user_to_row(user)
+        with self._conn() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO users (ID, FirstName, LastName, DateOfBirth, Email, Address, '
+                'EmployeesList, Department, Role) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                row
+            )
+
+    def get_user(self, userid: str) -> Optional[User]:
+        """Retrieve a user by ID"""
+        row = self._conn().execute('SELECT * FROM users WHERE ID = ?', (userid,)).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Retrieve a user by Email (indexed)"""
+        row = self._conn().execute('SELECT * FROM users WHERE Email = ?', (email,)).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def get_users_by_role(self, role) -> List[User]:
+        """Retrieve all users with a role (indexed)"""
+        role = role.value if isinstance(role, ROLE) else role
+        rows = self._conn().execute('SELECT * FROM users WHERE Role = ?', (role,))
+        return [self._row_to_user(row) for row in rows]
+
+    def get_all_users(self) -> List[User]:
+        """Retrieve all users"""
+        return [self._row_to_user(row) for row in self._conn().execute('SELECT * FROM users')]
+
+    def delete_user(self, userid: str) -> bool:
+        """Delete a user by ID. Returns True if deleted, False if not found"""
+        with self._conn() as conn:
+            return conn.execute('DELETE FROM users WHERE ID = ?', (userid,)).rowcount > 0
+
+    def user_exists(self, userid: str) -> bool:
+        """Check if a user exists"""
+        return self._conn().execute('SELECT 1 FROM users WHERE ID = ?', (userid,)).fetchone() is not None
+
+    def codeToMangaer(self, manager: User, code):
+        with self._conn() as conn:
+            conn.execute('INSERT OR REPLACE INTO manager_codes (Email, Code) VALUES (?, ?)', (manager.Email, code))
+
+    def get_all_code(self) -> List:
+        return [{row['Email']: row['Code']} for row in self._conn().execute('SELECT Email, Code FROM manager_codes')]
+
+    def import_json(self, filepath: str):
+        """Load a JsonUserStore document (users and codes) into this store"""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        with self._conn() as conn:
+            for key, value in data.items():
+                if isinstance(value, dict):
+                    conn.execute(
+                        'INSERT OR REPLACE INTO users (ID, FirstName, LastName, DateOfBirth, Email, Address, '
+                        'EmployeesList, Department, Role) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (value.get('ID', key), value.get('FirstName'), value.get('LastName'),
+                         value.get('DateOfBirth'), value.get('Email'), value.get('Address'),
+                         json.dumps(value.get('EmployeesList') or []), value.get('Department'), value.get('Role'))
+                    )
+                else:
+                    conn.execute('INSERT OR REPLACE INTO manager_codes (Email, Code) VALUES (?, ?)', (key, value))
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _user_to_row(self, user: User) -> tuple:
+        """Convert User object to a users row"""
+        department = user.Department.value if isinstance(user.Department, Department) else user.Department
+        role = user.Role.value if isinstance(user.Role, ROLE) else user.Role
+        return (
+            user.ID, user.FirstName, user.LastName, user.DateOfBirth, user.Email, user.Address,
+            json.dumps(user.EmployeesList or []), department, role
+        )
+
+    def _row_to_user(self, row: sqlite3.Row) -> User:
+        """Convert a users row to User object"""
+        department = row['Department']
+        if department in Department._value2member_map_:
+            department = Department(department)
+
+        role = ROLE(row['Role']) if row['Role'] in ROLE._value2member_map_ else ROLE.GUEST
+
+        return User(
+            ID=row['ID'],
+            FirstName=row['FirstName'],
+            LastName=row['LastName'],
+            DateOfBirth=row['DateOfBirth'],
+            Email=row['Email'],
+            Address=row['Address'],
+            EmployeesList=json.loads(row['EmployeesList']),
+            Department=department,
+            Role=role
+        )
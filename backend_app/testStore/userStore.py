@@ -0,0 +1,14 @@
+import os
+from testStore.userJson import JsonUserStore
+
+
+def openUserStore(backend=None, path=None):
+    """Open the user store picked by USER_STORE_BACKEND: ``json`` (JsonUserStore,
+    the default) or ``sqlite`` (SqliteUserStore). USER_STORE_PATH overrides the file."""
+    backend = (backend or os.getenv("USER_STORE_BACKEND", "json")).lower()
+    if backend == "json":
+        return JsonUserStore(path or os.getenv("USER_STORE_PATH", "./userJson.json"))
+    if backend == "sqlite":
+        from testStore.sqliteUserStore import SqliteUserStore
+        return SqliteUserStore(path or os.getenv("USER_STORE_PATH", "./userStore.db"))
+    raise ValueError(f"Unknown USER_STORE_BACKEND: {backend}")
@@ -0,0 +1,91 @@
+"""Shared fixtures for backend_app: its packages on sys.path and a fake Nexus."""
+
+import os
+import sys
+
+import pytest
+
+# backend_app imports Helperes, modeles, ... as top-level packages. Appended,
+# so Nexus's own app and config modules still win for the tests in tests/
+backendDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backendDir not in sys.path:
+    sys.path.append(backendDir)
+
+from Helperes.nexusClient import nexusClient
+from Helperes.userCache import identityCache
+
+
+class fakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {}
+
+    def json(self):
+        return self.body
+
+    @property
+    def text(self):
+        return str(self.body)
+
+
+class fakeNexus:
+    """Stands in for nexusClient: canned replies per (method, path), calls recorded.
+
+    A reply is ``(status, body)``, an exception to raise, or a callable
+    taking the call's keyword arguments and returning either.
+    """
+
+    def __init__(self):
+        self.replies = {}
+        self.calls = []
+
+    def reply(self, method, path, status=200, body=None):
+        self.replies[(method, path)] = (status, body)
+
+    def fail(self, method, path, error=None):
+        self.replies[(method, path)] = error or ConnectionError(f"{method} {path} failed")
+
+    def request(self, method, path, **kwargs):
+        self.calls.append((method, path, kwargs))
+        reply = self.replies.get((method, path), (404, {"status": 404, "message": "Not found"}))
+        if callable(reply):
+            reply = reply(**kwargs)
+        if isinstance(reply, Exception):
+            raise reply
+        return fakeResponse(*reply)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def getJson(self, path, params=None):
+        response = self.get(path, params=params)
+        return response.status_code, response.json()
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def called(self, method, path):
+        return sum(1 for call in self.calls if call[:2] == (method, path))
+
+
+@pytest.fixture
+def nexus(monkeypatch):
+    fake = fakeNexus()
+    monkeypatch.setattr(nexusClient, "_shared", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def freshIdentityCache():
+    ttl, maxSize = identityCache.ttl, identityCache.maxSize
+    identityCache.clear()
+    yield identityCache
+    identityCache.ttl, identityCache.maxSize = ttl, maxSize
+    identityCache.clear()
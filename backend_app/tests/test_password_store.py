@@ -0,0 +1,94 @@
+"""JsonUserPasswordStore: log appends, compaction and reloads across instances."""
+
+import json
+import threading
+
+import pytest
+from testStore.json_user_password_store import JsonUserPasswordStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "passJson.json")
+
+
+def readLog(path):
+    with open(path + ".log") as f:
+        return [json.loads(line) for line in f]
+
+
+def readSnapshot(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_writes_append_to_the_log(path):
+    store = JsonUserPasswordStore(path, compact_every=100)
+    store.set_password("1", "hash-1")
+    store.set_password(2, "hash-2")
+
+    assert readSnapshot(path) == {}
+    assert readLog(path) == [{"id": "1", "hash": "hash-1"}, {"id": "2", "hash": "hash-2"}]
+    assert store.get_password(2) == "hash-2"
+
+
+def test_log_is_compacted_into_the_snapshot(path):
+    store = JsonUserPasswordStore(path, compact_every=3)
+    for i in range(4):
+        store.set_password(str(i), f"hash-{i}")
+
+    assert readSnapshot(path) == {"0": "hash-0", "1": "hash-1", "2": "hash-2"}
+    assert readLog(path) == [{"id": "3", "hash": "hash-3"}]
+
+    store.compact()
+    assert readSnapshot(path) == {str(i): f"hash-{i}" for i in range(4)}
+    assert readLog(path) == []
+
+
+def test_instances_see_each_others_writes(path):
+    first = JsonUserPasswordStore(path, compact_every=2)
+    second = JsonUserPasswordStore(path, compact_every=2)
+
+    first.set_password("1", "hash-1")
+    assert second.get_password("1") == "hash-1"
+
+    # Compacts: the entry moves from the log to the snapshot
+    second.set_password("2", "hash-2")
+    assert readLog(path) == []
+    assert first.get_password("1") == "hash-1"
+    assert first.get_password("2") == "hash-2"
+
+    first.set_password("1", "hash-1b")
+    assert second.get_password("1") == "hash-1b"
+
+
+def test_torn_trailing_line_is_skipped(path):
+    store = JsonUserPasswordStore(path)
+    store.set_password("1", "hash-1")
+    with open(path + ".log", "a") as f:
+        f.write('{"id": "2", "ha')
+
+    assert JsonUserPasswordStore(path).get_password("1") == "hash-1"
+
+
+def test_reload_is_not_split_by_a_compaction(path):
+    writer = JsonUserPasswordStore(path, compact_every=100)
+    reader = JsonUserPasswordStore(path, compact_every=100)
+    writer.set_password("1", "hash-1")
+
+    compaction = threading.Thread(target=writer.compact)
+    readSnapshotFirst = reader._read
+
+    def readThenCompact():
+        # Snapshot read; a compaction now would empty the log before it is read
+        data = readSnapshotFirst()
+        compaction.start()
+        compaction.join(timeout=0.2)
+        assert compaction.is_alive(), "compaction ran during a reload"
+        return data
+
+    reader._read = readThenCompact
+    assert reader.get_password("1") == "hash-1"
+
+    compaction.join(timeout=5)
+    assert readSnapshot(path) == {"1": "hash-1"}
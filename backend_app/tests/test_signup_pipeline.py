@@ -0,0 +1,130 @@
+"""signupPipeline: concurrent auth/profile creation and the compensation paths."""
+
+import pytest
+from Helperes.signupPipeline import signupPipeline
+from Helperes.userCache import identityCache
+from modeles.user import User
+
+EMAIL = "new@example.com"
+PROFILE = {"id": 7, "email": EMAIL, "first_name": "F", "last_name": "L", "role": "employee"}
+
+
+class fakeAuth:
+    """authHelper stand-in: CreateUserWithId result and DeleteUser behaviour are canned."""
+
+    def __init__(self, ok=True, deleteError=None, deleteOk=True):
+        self.ok = ok
+        self.deleteError = deleteError
+        self.deleteOk = deleteOk
+        self.created = []
+        self.deleted = []
+
+    def CreateUserWithId(self, Email, password):
+        self.created.append(Email)
+        return (True, "auth-1") if self.ok else (False, None)
+
+    def DeleteUser(self, userId):
+        self.deleted.append(userId)
+        if self.deleteError:
+            raise self.deleteError
+        return self.deleteOk
+
+
+class asyncNexus:
+    """The pipeline's async Nexus client, answered by the sync fake."""
+
+    def __init__(self, nexus):
+        self.nexus = nexus
+
+    async def get(self, path, **kwargs):
+        return self.nexus.get(path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return self.nexus.post(path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return self.nexus.put(path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return self.nexus.delete(path, **kwargs)
+
+
+@pytest.fixture
+def nexus(nexus, monkeypatch):
+    monkeypatch.setattr(signupPipeline, "_client", asyncNexus(nexus))
+    nexus.reply("POST", "/users/", 201, {"data": PROFILE})
+    nexus.reply("DELETE", "/users/7", 200, {"message": "User deleted successfully"})
+    return nexus
+
+
+def signUp(auth, managerCode=None):
+    return signupPipeline(auth).signUp(EMAIL, "F", "L", "1990-01-01", "Street", "Password123", managerCode)
+
+
+def test_success(nexus):
+    auth = fakeAuth()
+    identityCache.set(EMAIL, User(Email=EMAIL))
+
+    ok, user, failedStep = signUp(auth)
+
+    assert (ok, user.getId(), failedStep) == (True, 7, None)
+    assert auth.created == [EMAIL] and auth.deleted == []
+    assert nexus.called("DELETE", "/users/7") == 0
+    assert identityCache.get(EMAIL) is None
+
+
+def test_success_with_invite_assigns_manager(nexus):
+    nexus.reply("GET", "/invites/CODE0001", body={"data": {"is_active": True, "manager_id": 3}})
+    nexus.reply("PUT", "/users/7", body={"data": dict(PROFILE, manager_id=3)})
+
+    ok, user, _ = signUp(fakeAuth(), "CODE0001")
+
+    assert ok and user.getId() == 7
+    assert nexus.calls[-1][:2] == ("PUT", "/users/7")
+    assert nexus.calls[-1][2]["json"] == {"manager_id": 3}
+
+
+@pytest.mark.parametrize("profileFailure", ["status", "exception"])
+def test_profile_failure_deletes_auth_account(nexus, profileFailure):
+    if profileFailure == "status":
+        nexus.reply("POST", "/users/", 500, {"message": "boom"})
+    else:
+        nexus.fail("POST", "/users/")
+    auth = fakeAuth()
+
+    assert signUp(auth, "CODE0001") == (False, None, "profile")
+    assert auth.deleted == ["auth-1"]
+    assert nexus.called("DELETE", "/users/7") == 0
+    assert nexus.called("PUT", "/users/7") == 0
+
+
+def test_auth_failure_deletes_profile(nexus):
+    auth = fakeAuth(ok=False)
+
+    assert signUp(auth) == (False, None, "auth")
+    assert nexus.called("DELETE", "/users/7") == 1
+    assert auth.deleted == []
+
+
+@pytest.mark.parametrize("auth", [
+    fakeAuth(deleteError=RuntimeError("auth down")),
+    fakeAuth(deleteOk=False),
+], ids=["raises", "refused"])
+def test_failed_auth_rollback_still_reports_the_failure(nexus, capsys, auth):
+    nexus.reply("POST", "/users/", 500, {"message": "boom"})
+
+    assert signUp(auth) == (False, None, "profile")
+    assert auth.deleted == ["auth-1"]
+    assert "account auth-1 for new@example.com left behind" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("deleteFailure", ["status", "exception"])
+def test_failed_profile_rollback_still_reports_the_failure(nexus, capsys, deleteFailure):
+    if deleteFailure == "status":
+        nexus.reply("DELETE", "/users/7", 500, {"message": "boom"})
+    else:
+        nexus.fail("DELETE", "/users/7")
+
+    assert signUp(fakeAuth(ok=False)) == (False, None, "auth")
+    assert nexus.called("DELETE", "/users/7") == 1
+    assert "Profile rollback" in capsys.readouterr().out
@@ -0,0 +1,193 @@
+"""tokenClaims: the version table's refresh policy, isRevoked and roleRequired."""
+
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token
+from Helperes import tokenClaims as tokenClaimsModule
+from Helperes.tokenClaims import tokenClaims, tokenVersions
+from modeles.role import ROLE
+
+VERSIONS_PATH = "/users/token-versions"
+
+
+class fakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = fakeClock()
+    monkeypatch.setattr(tokenClaimsModule, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def table(monkeypatch, nexus):
+    """A fresh table behind tokenClaims: 15 s TTL, trusted for 60 s."""
+    table = tokenVersions(ttl=15, maxStaleness=60)
+    monkeypatch.setattr(tokenClaimsModule, "versionTable", table)
+    return table
+
+
+def versions(**byUserId):
+    return {"status": 200, "data": {userId.lstrip("u"): version for userId, version in byUserId.items()}}
+
+
+def test_lookups_between_refreshes_stay_local(clock, nexus, table):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+
+    assert table.current(7) == 2
+    assert table.current(8) == 0
+    clock.now += 14
+    assert table.current(7) == 2
+    assert nexus.called("GET", VERSIONS_PATH) == 1
+
+    clock.now += 2
+    table.current(7)
+    assert nexus.called("GET", VERSIONS_PATH) == 2
+
+
+def test_first_load_blocks_concurrent_lookups(nexus, table):
+    def slowReply(**kwargs):
+        time.sleep(0.2)
+        return 200, versions(u7=3)
+
+    nexus.replies[("GET", VERSIONS_PATH)] = slowReply
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(table.current(7))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert seen == [3] * 8
+    assert nexus.called("GET", VERSIONS_PATH) == 1
+
+
+def test_failed_refresh_keeps_table_and_retries_sooner(clock, nexus, table):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+    table.current(7)
+
+    clock.now += 16
+    nexus.fail("GET", VERSIONS_PATH)
+    assert table.current(7) == 2
+    assert nexus.called("GET", VERSIONS_PATH) == 2
+
+    clock.now += table.retryAfter + 0.1
+    nexus.reply("GET", VERSIONS_PATH, status=500, body={"status": 500})
+    assert table.current(7) == 2
+    assert nexus.called("GET", VERSIONS_PATH) == 3
+
+    clock.now += table.retryAfter + 0.1
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=4))
+    assert table.current(7) == 4
+
+
+def test_version_change_clears_identity_cache(clock, nexus, table, freshIdentityCache):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=1))
+    table.current(7)
+    freshIdentityCache.set("a@example.com", "A")
+
+    clock.now += 16
+    table.current(7)
+    assert freshIdentityCache.get("a@example.com") == "A"
+
+    clock.now += 16
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+    table.current(7)
+    assert freshIdentityCache.get("a@example.com") is None
+
+
+def test_is_revoked_compares_version_stamps(clock, nexus, table):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+
+    assert tokenClaims.isRevoked({"sub": "a@example.com"})
+    assert tokenClaims.isRevoked({"uid": 7, "ver": 1})
+    assert tokenClaims.isRevoked({"uid": 7})
+    assert not tokenClaims.isRevoked({"uid": 7, "ver": 2})
+    assert not tokenClaims.isRevoked({"uid": 8, "ver": 0})
+
+
+def test_is_revoked_fails_closed_before_first_load(clock, nexus, table):
+    nexus.fail("GET", VERSIONS_PATH)
+
+    assert tokenClaims.isRevoked({"uid": 8, "ver": 0})
+
+    clock.now += table.retryAfter + 0.1
+    nexus.reply("GET", VERSIONS_PATH, body=versions())
+    assert not tokenClaims.isRevoked({"uid": 8, "ver": 0})
+
+
+def test_is_revoked_fails_closed_once_table_is_too_old(clock, nexus, table):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+    assert not tokenClaims.isRevoked({"uid": 7, "ver": 2})
+
+    nexus.fail("GET", VERSIONS_PATH)
+    clock.now += 59
+    assert not tokenClaims.isRevoked({"uid": 7, "ver": 2})
+    clock.now += 2
+    assert tokenClaims.isRevoked({"uid": 7, "ver": 2})
+
+    clock.now += table.retryAfter + 0.1
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=2))
+    assert not tokenClaims.isRevoked({"uid": 7, "ver": 2})
+
+
+def test_zero_max_staleness_keeps_last_table(clock, nexus, table):
+    table.maxStaleness = 0
+    nexus.fail("GET", VERSIONS_PATH)
+
+    clock.now += 3600
+    assert not tokenClaims.isRevoked({"uid": 7, "ver": 0})
+
+
+@pytest.fixture
+def hrApp(table):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-with-enough-bytes-for-hs256"
+    jwt = JWTManager(app)
+
+    @jwt.token_in_blocklist_loader
+    def isTokenRevoked(jwt_header, jwt_payload):
+        return tokenClaims.isRevoked(jwt_payload)
+
+    @app.route("/hr")
+    @tokenClaims.roleRequired(ROLE.HR, ROLE.ADMIN)
+    def hrOnly():
+        return jsonify({"Text": "ok"}), 200
+
+    return app
+
+
+def bearer(app, role, uid=7, ver=0):
+    with app.app_context():
+        token = create_access_token(identity="a@example.com", additional_claims={"role": role, "uid": uid, "ver": ver})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_role_required_allows_listed_roles(nexus, hrApp):
+    nexus.reply("GET", VERSIONS_PATH, body=versions())
+    client = hrApp.test_client()
+
+    assert client.get("/hr", headers=bearer(hrApp, "HR")).status_code == 200
+    assert client.get("/hr", headers=bearer(hrApp, "ADMIN")).status_code == 200
+
+    response = client.get("/hr", headers=bearer(hrApp, "EMPLOYER"))
+    assert response.status_code == 401
+    assert response.get_json() == {"Text": "not authorized"}
+
+
+def test_role_required_rejects_missing_and_revoked_tokens(nexus, hrApp):
+    nexus.reply("GET", VERSIONS_PATH, body=versions(u7=1))
+    client = hrApp.test_client()
+
+    assert client.get("/hr").status_code == 401
+    assert client.get("/hr", headers=bearer(hrApp, "HR", ver=0)).status_code == 401
+    assert client.get("/hr", headers=bearer(hrApp, "HR", ver=1)).status_code == 200
@@ -0,0 +1,109 @@
+"""identityCache: TTL expiry, LRU eviction and invalidation by the writers."""
+
+import pytest
+from Helperes import userCache as userCacheModule
+from Helperes.userCache import identityCache, userCache
+from Helperes.userHelper import userHelper
+from modeles.role import ROLE
+from modeles.user import User
+
+
+class fakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = fakeClock()
+    monkeypatch.setattr(userCacheModule, "time", clock)
+    return clock
+
+
+def nexusUser(userId, email, role="employee", managerId=None):
+    return {"id": userId, "email": email, "first_name": "F", "last_name": "L",
+            "role": role, "manager_id": managerId}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = userCache(ttl=10, maxSize=8)
+    cache.set("a@example.com", "A")
+
+    clock.now += 9.9
+    assert cache.get("a@example.com") == "A"
+
+    clock.now += 0.2
+    assert cache.get("a@example.com") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = userCache(ttl=10, maxSize=2)
+    cache.set("a@example.com", "A")
+    cache.set("b@example.com", "B")
+    cache.get("a@example.com")
+    cache.set("c@example.com", "C")
+
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") == "A"
+    assert cache.get("c@example.com") == "C"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = userCache(ttl=10, maxSize=2)
+    cache.set("a@example.com", "A")
+    cache.disable()
+    cache.set("b@example.com", "B")
+
+    assert cache.stats()["size"] == 0
+    assert cache.get("a@example.com") is None
+
+
+def test_lookups_are_served_from_the_cache(nexus):
+    nexus.reply("GET", "/users/by-email/a%40example.com", body={"data": nexusUser(1, "a@example.com", "manager")})
+
+    first = userHelper.getUserByEmail("a@example.com")
+    second = userHelper.getUserByEmail("a@example.com")
+
+    assert second is first
+    assert first.getRole() == ROLE.MANAGER
+    assert nexus.called("GET", "/users/by-email/a%40example.com") == 1
+
+
+def test_create_user_invalidates(nexus):
+    identityCache.set("new@example.com", User(Email="new@example.com", Role=ROLE.GUEST))
+    nexus.reply("POST", "/users/", 201, {"data": nexusUser(7, "new@example.com")})
+
+    ok, user = userHelper.CreateUser("new@example.com", "F", "L", "1990-01-01", "Street", "Password123")
+
+    assert ok and user.getId() == 7
+    assert identityCache.get("new@example.com") is None
+
+
+def test_assign_code_invalidates_manager(nexus):
+    manager = User(Email="boss@example.com", ID=3, Role=ROLE.MANAGER)
+    identityCache.set("boss@example.com", manager)
+    nexus.reply("POST", "/invites/", 201, {"data": {}})
+
+    userHelper.assignCodeToManager(manager, "CODE1234")
+
+    assert nexus.called("POST", "/invites/") == 1
+    assert identityCache.get("boss@example.com") is None
+
+
+def test_add_employee_invalidates_both(nexus):
+    employee = User(Email="emp@example.com", ID=8)
+    manager = User(Email="boss@example.com", ID=3, Role=ROLE.MANAGER)
+    identityCache.set("emp@example.com", employee)
+    identityCache.set("boss@example.com", manager)
+    nexus.reply("PUT", "/users/8", body={"data": nexusUser(8, "emp@example.com", managerId=3)})
+
+    assert userHelper.addemployerTomanager(manager, employee)
+
+    assert nexus.calls[-1][2]["json"] == {"manager_id": 3}
+    assert identityCache.get("emp@example.com") is None
+    assert identityCache.get("boss@example.com") is None
@@ -0,0 +1,120 @@
+"""SqliteUserStore: WAL mode, concurrent writers and parity with JsonUserStore."""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+from modeles.department import Department
+from modeles.role import ROLE
+from modeles.user import User
+from testStore.sqliteUserStore import SqliteUserStore
+from testStore.userJson import JsonUserStore
+from testStore.userStore import openUserStore
+
+
+def makeUser(userId, role=ROLE.EMPLOYER):
+    return User(ID=userId, Email=f"{userId}@example.com", FirstName="F", LastName="L",
+                DateOfBirth="1990-01-01", Address="Street", EmployeesList=["x"], Role=role)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    store = openUserStore(request.param, str(tmp_path / f"users.{request.param}"))
+    yield store
+    if isinstance(store, SqliteUserStore):
+        store.close()
+
+
+def test_switch_picks_the_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER_STORE_BACKEND", "sqlite")
+    monkeypatch.setenv("USER_STORE_PATH", str(tmp_path / "users.db"))
+    assert isinstance(openUserStore(), SqliteUserStore)
+
+    monkeypatch.setenv("USER_STORE_BACKEND", "json")
+    monkeypatch.setenv("USER_STORE_PATH", str(tmp_path / "users.json"))
+    assert isinstance(openUserStore(), JsonUserStore)
+
+    with pytest.raises(ValueError):
+        openUserStore("csv")
+
+
+def test_reads_match_json_store(store):
+    store.add_user(makeUser("u1"))
+    store.add_user(makeUser("u2", ROLE.MANAGER))
+    store.add_user(makeUser("u1", ROLE.HR))  # replaces
+
+    user = store.get_user("u1")
+    assert (user.ID, user.Email, user.Role, user.EmployeesList) == ("u1", "u1@example.com", ROLE.HR, ["x"])
+    assert store.get_user("missing") is None
+    assert sorted(u.ID for u in store.get_all_users()) == ["u1", "u2"]
+    assert store.user_exists("u2") and not store.user_exists("missing")
+
+    assert store.delete_user("u1") is True
+    assert store.delete_user("u1") is False
+    assert store.get_user("u2").Role == ROLE.MANAGER
+
+    # JsonUserStore keeps codes in the user map, so get_all_users stops working after this
+    store.codeToMangaer(makeUser("u2"), "CODE0001")
+    assert store.get_all_code() == [{"u2@example.com": "CODE0001"}]
+
+
+def test_indexed_lookups(tmp_path):
+    store = SqliteUserStore(str(tmp_path / "users.db"))
+    store.add_user(makeUser("u1"))
+    store.add_user(makeUser("u2", ROLE.MANAGER))
+    store.add_user(User(ID="u3", Email="u3@example.com", Department=Department.IT, Role=ROLE.MANAGER))
+
+    assert store.get_user_by_email("u2@example.com").ID == "u2"
+    assert sorted(u.ID for u in store.get_users_by_role(ROLE.MANAGER)) == ["u2", "u3"]
+    assert store.get_user("u3").Department == Department.IT
+
+    plan = store._conn().execute("EXPLAIN QUERY PLAN SELECT * FROM users WHERE Email = ?", ("x",)).fetchall()
+    assert "ix_users_email" in plan[0][-1]
+
+
+def test_uses_wal(tmp_path):
+    path = str(tmp_path / "users.db")
+    SqliteUserStore(path).add_user(makeUser("u1"))
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / "users.db")
+    stores = [SqliteUserStore(path), SqliteUserStore(path)]
+    errors = []
+
+    def write(worker):
+        try:
+            for i in range(50):
+                stores[worker % 2].add_user(makeUser(f"w{worker}-{i}"))
+                stores[worker % 2].codeToMangaer(makeUser(f"w{worker}-{i}"), f"C{worker}{i}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(stores[0].get_all_users()) == 400
+    assert len(stores[1].get_all_code()) == 400
+
+
+def test_imports_a_json_document(tmp_path):
+    source = tmp_path / "userJson.json"
+    jsonStore = JsonUserStore(str(source))
+    jsonStore.add_user(makeUser("u1", ROLE.MANAGER))
+    jsonStore.codeToMangaer(makeUser("u1"), "CODE0001")
+
+    store = SqliteUserStore(str(tmp_path / "users.db"))
+    store.import_json(str(source))
+
+    assert store.get_user("u1").Role == ROLE.MANAGER
+    assert store.get_all_code() == [{"u1@example.com": "CODE0001"}]
+    assert json.loads(source.read_text())["u1@example.com"] == "CODE0001"
@@ -0,0 +1,10 @@
+"""
+Load-test and benchmark suite for Nexus and backend_app.
+
+    dataset.py        synthetic users, managers and invite codes
+    supabase_stub.py  in-memory stand-in for the Supabase auth client
+    run.py            scenarios, percentiles and JSON reports
+    startup.py        cold-start (-X importtime) budget check
+
+Run with ``python -m benchmarks.run --help`` from the repository root.
+"""
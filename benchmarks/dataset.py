@@ -0,0 +1,117 @@
+"""
+Synthetic dataset for benchmarks: N employees, M managers, K invite codes.
+
+Rows are bulk inserted with a single shared password hash, so even large
+datasets load in seconds. Must be called inside a Nexus app context.
+
+    FLASK_ENV=testing python -m benchmarks.dataset --users 10000 --managers 200 --invites 1000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+from sqlalchemy import insert, select
+from models import InviteCode, User, db
+from models.org_tree import rebuild_org_paths
+
+DEFAULT_PASSWORD = 'BenchPass#2024'
+DEPARTMENTS = ('IT', 'HR', 'Finance', 'Sales', 'Operations')
+
+
+def generate(users=1000, managers=50, invites=200, hr=1, seed=42, password=DEFAULT_PASSWORD):
+    """
+    Insert a reproducible dataset into the current database.
+
+    Employees are spread over managers at random (seeded) and invite codes
+    are unlimited-use, so scenarios can redeem them any number of times.
+
+    Returns:
+        dict: emails per role, user ids by email, invite codes and the password
+    """
+    rng = random.Random(seed)
+
+    probe = User()
+    probe.set_password(password)
+    password_hash = probe.password_hash
+
+    def rows(prefix, role, count, manager_ids=None):
+        return [
+            {
+                'email': f'bench-{prefix}-{i}@example.com',
+                'password_hash': password_hash,
+                'role': role,
+                'first_name': prefix.title(),
+                'last_name': str(i),
+                'department': rng.choice(DEPARTMENTS),
+                'manager_id': rng.choice(manager_ids) if manager_ids else None,
+            }
+            for i in range(count)
+        ]
+
+    if hr:
+        db.session.execute(insert(User), rows('hr', 'hr', hr))
+    if managers:
+        db.session.execute(insert(User), rows('manager', 'manager', managers))
+
+    manager_ids = list(db.session.scalars(select(User.id).where(User.role == 'manager')))
+    if users:
+        db.session.execute(insert(User), rows('user', 'employee', users, manager_ids))
+
+    codes = [f'BENCH{i:06d}' for i in range(invites)]
+    if codes and manager_ids:
+        db.session.execute(insert(InviteCode), [
+            {'code': code, 'manager_id': rng.choice(manager_ids), 'max_uses': 0}
+            for code in codes
+        ])
+
+    db.session.commit()
+    rebuild_org_paths()
+
+    ids = dict(db.session.execute(select(User.email, User.id).where(User.email.like('bench-%'))).all())
+    return {
+        'password': password,
+        'hr': [e for e in ids if e.startswith('bench-hr-')],
+        'managers': [e for e in ids if e.startswith('bench-manager-')],
+        'users': [e for e in ids if e.startswith('bench-user-')],
+        'ids': ids,
+        'invites': codes,
+    }
+
+
+def write_backend_passwords(dataset, path):
+    """
+    Write a passJson snapshot so backend_app logins succeed for every user.
+
+    Uses the same sha512 scheme as backend_app's passwordHelper.
+    """
+    digest = hashlib.sha512(dataset['password'].encode()).hexdigest()
+    with open(path, 'w') as f:
+        json.dump({str(user_id): digest for user_id in dataset['ids'].values()}, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load a benchmark dataset into the configured database.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--managers', type=int, default=50)
+    parser.add_argument('--invites', type=int, default=200)
+    parser.add_argument('--hr', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--passwords', help='Also write a backend_app passJson file here')
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app(os.getenv('FLASK_ENV'))
+    with app.app_context():
+        db.create_all()
+        dataset = generate(args.users, args.managers, args.invites, args.hr, args.seed)
+        if args.passwords:
+            write_backend_passwords(dataset, args.passwords)
+
+    print(f"Inserted {len(dataset['users'])} users, {len(dataset['managers'])} managers, "
+          f"{len(dataset['hr'])} HR and {len(dataset['invites'])} invite codes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Scripted load scenarios for Nexus and backend_app.
+
+Everything runs in one process: Nexus (TestingConfig) is served over HTTP
+on an ephemeral port, backend_app is driven through its Flask test client
+and talks to Nexus through its normal HTTP clients, and Supabase auth is
+replaced by benchmarks.supabase_stub.
+
+    python -m benchmarks.run                          # all scenarios, SQLite
+    python -m benchmarks.run -s login_storm -n 2000 -c 32
+    TEST_DATABASE_URL=postgresql://.../meetingdb_bench python -m benchmarks.run
+    python -m benchmarks.run --compare benchmarks/results/<old>.json --max-regression 15
+
+Scenarios:
+    login_storm          POST /login for existing users
+    signup_with_invite   POST /signup with a manager invite code
+    hr_list_all          GET /hr/getallemp as an HR user
+    invite_redemption    POST /invites/<code>/use on a few codes with limited uses
+
+Each scenario reports throughput and p50/p95/p99 latency. The report is
+written as JSON (default benchmarks/results/<commit>.json).
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, 'backend_app')
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)  # setup() changes the working directory
+SCENARIOS = ('login_storm', 'signup_with_invite', 'hr_list_all', 'invite_redemption')
+
+# Codes used by invite_redemption and how often each may be redeemed
+CONTENTION_CODES = 4
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, statuses, wall, concurrency, ok_statuses):
+    latencies = sorted(latencies)
+    ok = sum(count for status, count in statuses.items() if status in ok_statuses)
+    to_ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'ok': ok,
+        'errors': len(latencies) - ok,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'wall_seconds': round(wall, 4),
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else None,
+        'latency_ms': {
+            'p50': to_ms(percentile(latencies, 50)),
+            'p95': to_ms(percentile(latencies, 95)),
+            'p99': to_ms(percentile(latencies, 99)),
+            'mean': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+            'max': to_ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+def drive(call, requests, concurrency, ok_statuses=(200,), warmup=0):
+    """
+    Run ``call(i)`` for i in range(requests) on ``concurrency`` threads.
+
+    ``call`` returns an HTTP status; its wall time is the latency sample.
+    """
+    for i in range(warmup):
+        call(-1 - i)
+
+    latencies = [0.0] * requests
+    results = [0] * requests
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            results[i] = call(i)
+        except Exception:
+            results[i] = 599
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+
+    statuses = {}
+    for status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return summarize(latencies, statuses, wall, concurrency, ok_statuses)
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Werkzeug request handler without per-request access logging."""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class Bench:
+    """Sets up Nexus, the dataset, the Supabase stub and backend_app once."""
+
+    def __init__(self, args):
+        self.args = args
+        self.workdir = tempfile.mkdtemp(prefix='nexus-bench-')
+        os.environ['FLASK_ENV'] = 'testing'
+        os.environ.setdefault('TEST_DATABASE_URL', 'sqlite:///' + os.path.join(self.workdir, 'nexus.db'))
+        # Keep the list cache out of the numbers unless asked for
+        os.environ.setdefault('RESULT_CACHE_BACKEND', args.result_cache)
+
+    def setup(self):
+        from app import create_app
+        from models import db
+        from benchmarks.dataset import generate, write_backend_passwords
+
+        self.nexus = create_app('testing')
+        self.headers = {'X-Internal-Key': self.nexus.config['INTERNAL_API_KEY']}
+        self.database = self.nexus.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0]
+
+        with self.nexus.app_context():
+            db.drop_all()
+            db.create_all()
+            self.dataset = generate(self.args.users, self.args.managers, self.args.invites, seed=self.args.seed)
+            self.contention_codes = self._contention_codes(db)
+
+        self.server = make_server('127.0.0.1', 0, self.nexus, threaded=True, request_handler=QuietHandler)
+        threading.Thread(target=self.server.serve_forever, name='nexus-bench', daemon=True).start()
+        self.nexus_url = f'http://127.0.0.1:{self.server.server_port}'
+        os.environ['NEXUS_API_URL'] = self.nexus_url
+        os.environ['INTERNAL_API_KEY'] = self.nexus.config['INTERNAL_API_KEY']
+
+        # backend_app resolves its stores relative to the working directory
+        os.chdir(self.workdir)
+        write_backend_passwords(self.dataset, os.path.join(self.workdir, 'passJson.json'))
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+
+        from benchmarks.supabase_stub import install
+        self.supabase = install(self.args.auth_latency_ms / 1000)
+        for email in self.dataset['hr'] + self.dataset['managers'] + self.dataset['users']:
+            self.supabase.auth.register(email, self.dataset['password'])
+
+        spec = importlib.util.spec_from_file_location('backend_app_main', os.path.join(BACKEND_DIR, 'app.py'))
+        self.backend_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.backend_module)
+        self.backend = self.backend_module.app
+
+    def _contention_codes(self, db):
+        from models import InviteCode, User
+
+        manager = User.query.filter(User.role == 'manager').first()
+        uses = max(1, self.args.requests // (CONTENTION_CODES * 2))
+        codes = [f'RACE{i:04d}' for i in range(CONTENTION_CODES)]
+        db.session.add_all(InviteCode(code=code, manager_id=manager.id, max_uses=uses) for code in codes)
+        db.session.commit()
+        return {'codes': codes, 'max_uses': uses}
+
+    def teardown(self):
+        self.server.shutdown()
+
+    # Scenarios
+
+    def login_storm(self):
+        users = self.dataset['users']
+        password = self.dataset['password']
+
+        def call(i):
+            with self.backend.test_client() as client:
+                email = users[i % len(users)]
+                return client.post('/login', json={'email': email, 'password': password}).status_code
+
+        return drive(call, self.args.requests, self.args.concurrency, warmup=self.args.warmup)
+
+    def signup_with_invite(self):
+        codes = self.dataset['invites']
+        run = int(time.time())
+
+        def call(i):
+            with self.backend.test_client() as client:
+                return client.post('/signup', json={
+                    'email': f'bench-signup-{run}-{i}@example.com',
+                    'FirstName': 'Signup',
+                    'LastName': str(i),
+                    'Password': self.dataset['password'],
+                    'DateOfBirth': '1990-01-01',
+                    'Address': '1 Bench Street',
+                    'managercode': codes[i % len(codes)],
+                }).status_code
+
+        return drive(call, self.args.requests, self.args.concurrency, warmup=self.args.warmup)
+
+    def hr_list_all(self):
+        from flask_jwt_extended import create_access_token
+
+        module = self.backend_module
+        hr = module.userHelper.getUserByEmail(self.dataset['hr'][0])
+        with self.backend.app_context():
+            token = create_access_token(identity=hr.getEmail(), additional_claims=module.tokenClaims.forUser(hr))
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def call(i):
+            with self.backend.test_client() as client:
+                return client.get('/hr/getallemp', headers=headers).status_code
+
+        return drive(call, self.args.requests, self.args.concurrency, warmup=self.args.warmup)
+
+    def invite_redemption(self):
+        import requests
+        from models import InviteCode
+
+        codes = self.contention_codes['codes']
+        max_uses = self.contention_codes['max_uses']
+        local = threading.local()
+
+        def call(i):
+            if i < 0:
+                return 200  # no warmup: it would consume uses
+            session = getattr(local, 'session', None)
+            if session is None:
+                session = local.session = requests.Session()
+                session.headers.update(self.headers)
+            code = codes[i % len(codes)]
+            return session.post(f'{self.nexus_url}/invites/{code}/use', json={}).status_code
+
+        # 400 is the expected answer once a code is used up
+        result = drive(call, self.args.requests, self.args.concurrency, ok_statuses=(200, 400))
+
+        with self.nexus.app_context():
+            used = {code: count for code, count in
+                    InviteCode.query.with_entities(InviteCode.code, InviteCode.used_count)
+                    .filter(InviteCode.code.in_(codes))}
+        result['redeemed'] = result['statuses'].get('200', 0)
+        result['max_uses_per_code'] = max_uses
+        result['oversold'] = sum(max(0, count - max_uses) for count in used.values())
+        return result
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                             cwd=ROOT, text=True).strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(report, baseline, max_regression=None):
+    """
+    Print per-scenario deltas against a baseline report.
+
+    Returns:
+        bool: False if p95 or throughput regressed by more than max_regression percent
+    """
+    ok = True
+    print(f"\n--- Compared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}) ---")
+    for name, current in report['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if not previous:
+            continue
+        cells, regressed = [], False
+        for label, old, new, higher_is_better in (
+            ('rps', previous['throughput_rps'], current['throughput_rps'], True),
+            ('p50', previous['latency_ms']['p50'], current['latency_ms']['p50'], False),
+            ('p95', previous['latency_ms']['p95'], current['latency_ms']['p95'], False),
+            ('p99', previous['latency_ms']['p99'], current['latency_ms']['p99'], False),
+        ):
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            cells.append(f'{label} {change:+.1f}%')
+            if max_regression is not None and label in ('rps', 'p95') and worse > max_regression:
+                regressed = True
+        ok = ok and not regressed
+        mark = '❌' if regressed else '✅'
+        print(f"{mark} {name:20s} " + '  '.join(cells))
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark Nexus and backend_app.')
+    parser.add_argument('-s', '--scenario', action='append', choices=SCENARIOS,
+                        help='Scenario to run (repeatable, default: all)')
+    parser.add_argument('-n', '--requests', type=int, default=500, help='Requests per scenario')
+    parser.add_argument('-c', '--concurrency', type=int, default=16)
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests before each scenario')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--managers', type=int, default=50)
+    parser.add_argument('--invites', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--auth-latency-ms', type=float, default=0.0,
+                        help='Simulated Supabase round trip per auth call')
+    parser.add_argument('--result-cache', default='none', choices=('none', 'local'),
+                        help='Nexus list result cache during the run')
+    parser.add_argument('-o', '--output', help='JSON report path (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Baseline JSON report to diff against')
+    parser.add_argument('--max-regression', type=float,
+                        help='With --compare: exit 1 if p95 or throughput is this many percent worse')
+    parser.add_argument('-v', '--verbose', action='store_true', help="Keep the apps' own stdout output")
+    args = parser.parse_args(argv)
+
+    bench = Bench(args)
+    bench.setup()
+    commit, dirty = git_commit()
+
+    report = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': bench.database,
+            'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'verbose')},
+        },
+        'scenarios': {},
+    }
+
+    print(f"--- Nexus on {bench.nexus_url} ({bench.database}), "
+          f"{len(bench.dataset['users'])} users, {args.requests} requests x {args.concurrency} threads ---")
+    for name in args.scenario or SCENARIOS:
+        # The backend prints on every request; keep that out of the timings
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            result = getattr(bench, name)()
+        report['scenarios'][name] = result
+        latency = result['latency_ms']
+        extra = f" oversold={result['oversold']}" if 'oversold' in result else ''
+        print(f"{name:20s} {result['throughput_rps']:>9} req/s  p50={latency['p50']}ms "
+              f"p95={latency['p95']}ms p99={latency['p99']}ms  errors={result['errors']}{extra}")
+
+    bench.teardown()
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(report, json.load(f), args.max_regression):
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Cold-start budget check for Nexus and backend_app.
+
+Each target is started in a fresh interpreter several times. Its median
+time to a ready application (interpreter start, imports and app creation)
+is compared with a budget. One extra ``python -X importtime`` run lists
+the slowest imports, so a regression points at the module that caused it.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget nexus=900 --budget backend=600 --runs 7
+
+Exits 1 when a target is over budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, 'backend_app')
+
+# Milliseconds to a ready app, median of --runs cold starts
+DEFAULT_BUDGETS = {
+    'nexus': 1150,
+    'backend': 650,
+}
+
+TARGETS = {
+    'nexus': (ROOT, "import app; app.create_app('testing')"),
+    'backend': (BACKEND_DIR, (
+        "import sys, importlib.util; sys.path.insert(0, '.'); "
+        "spec = importlib.util.spec_from_file_location('backend_app_main', 'app.py'); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    )),
+}
+
+
+def _env():
+    env = dict(os.environ, FLASK_ENV='testing')
+    env.setdefault('SUPABASE_URL', 'http://127.0.0.1:9')
+    env.setdefault('SUPABASE_KEY', 'startup-check')
+    return env
+
+
+def time_start(target):
+    """Wall time in ms for one cold start of ``target``."""
+    cwd, code = TARGETS[target]
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=cwd, env=_env(), check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def slowest_imports(target, top=10):
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        tuple: (total top-level import ms, [(cumulative ms, module)] slowest first)
+    """
+    cwd, code = TARGETS[target]
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=_env(),
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total, modules = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative = int(cumulative) / 1000
+        if not name[1:].startswith(' '):
+            total += cumulative  # top-level import
+        modules.append((cumulative, name.strip()))
+    return total, sorted(modules, reverse=True)[:top]
+
+
+def check(target, budget, runs):
+    time_start(target)  # warm the bytecode cache; we measure startup, not compilation
+    samples = [time_start(target) for _ in range(runs)]
+    median = statistics.median(samples)
+    imports, slowest = slowest_imports(target)
+    ok = median <= budget
+
+    mark = '✅' if ok else '❌'
+    print(f"{mark} {target:8s} ready in {median:7.1f} ms (budget {budget} ms, "
+          f"min {min(samples):.1f}, max {max(samples):.1f}); imports {imports:.1f} ms")
+    if not ok:
+        print('   slowest imports (cumulative):')
+        for cumulative, name in slowest:
+            print(f'   {cumulative:8.1f} ms  {name}')
+
+    return ok, {
+        'budget_ms': budget,
+        'median_ms': round(median, 1),
+        'samples_ms': [round(s, 1) for s in samples],
+        'imports_ms': round(imports, 1),
+        'slowest_imports': [{'module': name, 'cumulative_ms': round(ms, 1)} for ms, name in slowest],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fail if cold start exceeds its budget.')
+    parser.add_argument('-t', '--target', action='append', choices=sorted(TARGETS),
+                        help='Target to check (repeatable, default: all)')
+    parser.add_argument('--budget', action='append', default=[], metavar='TARGET=MS',
+                        help='Override a budget, e.g. nexus=900')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per target (median is used)')
+    parser.add_argument('-o', '--output', help='Also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        target, _, ms = item.partition('=')
+        budgets[target] = float(ms)
+
+    print(f'--- Cold start, median of {args.runs} runs ({sys.executable}) ---')
+    results, ok = {}, True
+    for target in args.target or sorted(TARGETS):
+        passed, results[target] = check(target, budgets[target], args.runs)
+        ok = ok and passed
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+In-memory stand-in for the Supabase client wrapped by ``supaBase.dataBaseAuth``.
+
+``install()`` swaps ``create_client`` in ``supaBase.supaBase`` so that
+dataBaseAuth's own methods run unchanged against the stub. Each call can
+sleep for a fixed latency to mimic the network round trip.
+"""
+
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+
+class StubAuthError(Exception):
+    """Raised where supabase-py would raise AuthApiError."""
+
+
+class StubAdmin:
+    def __init__(self, auth):
+        self._auth = auth
+
+    def delete_user(self, user_id):
+        self._auth._pause()
+        with self._auth._lock:
+            for email, user in list(self._auth.users.items()):
+                if user['id'] == user_id:
+                    del self._auth.users[email]
+                    return None
+        raise StubAuthError('User not found')
+
+
+class StubAuth:
+    """The ``client.auth`` surface used by dataBaseAuth."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.users = {}
+        self.calls = {'sign_up': 0, 'sign_in_with_password': 0, 'delete_user': 0}
+        self._lock = threading.Lock()
+        self.admin = StubAdmin(self)
+
+    def register(self, email, password):
+        """Pre-create an account without latency (dataset loading)."""
+        with self._lock:
+            self.users[email] = {'id': str(uuid.uuid4()), 'password': password}
+
+    def sign_up(self, credentials):
+        self._pause()
+        email, password = credentials['email'], credentials['password']
+        with self._lock:
+            self.calls['sign_up'] += 1
+            if email in self.users:
+                raise StubAuthError('User already registered')
+            user = self.users[email] = {'id': str(uuid.uuid4()), 'password': password}
+        return self._response(email, user)
+
+    def sign_in_with_password(self, credentials):
+        self._pause()
+        email, password = credentials['email'], credentials['password']
+        with self._lock:
+            self.calls['sign_in_with_password'] += 1
+            user = self.users.get(email)
+        if user is None or user['password'] != password:
+            raise StubAuthError('Invalid login credentials')
+        return self._response(email, user)
+
+    def _pause(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def _response(email, user):
+        return SimpleNamespace(
+            user=SimpleNamespace(id=user['id'], email=email),
+            session=SimpleNamespace(access_token=uuid.uuid4().hex),
+        )
+
+
+class StubClient:
+    def __init__(self, latency=0.0):
+        self.auth = StubAuth(latency)
+
+
+def install(latency=0.0):
+    """
+    Make every dataBaseAuth created from now on talk to one StubClient.
+
+    Call before importing backend_app's app module.
+
+    Returns:
+        StubClient: The shared stub, for seeding accounts and reading counters
+    """
+    from supaBase import supaBase
+
+    client = StubClient(latency)
+    supaBase.create_client = lambda url, key, options=None: client
+    return client
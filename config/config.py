@@ -1,6 +1,7 @@
 """Configuration settings for the application."""
 
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -37,11 +38,53 @@ class Config:
     
     # Internal Security
     INTERNAL_API_KEY = os.getenv('INTERNAL_API_KEY', 'nexus-internal-secret-key-123')
+    
+    # Production server (serve.py): one process per core, threads for I/O waits
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', str(os.cpu_count() or 1)))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', '4'))
+    SERVER_PRELOAD = os.getenv('SERVER_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', '5'))              # idle keep-alive seconds
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', '30'))                 # request/worker timeout seconds
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', '10000'))    # 0 = never recycle workers
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', '1000'))
+    SERVER_ACCESS_LOG = os.getenv('SERVER_ACCESS_LOG') or None              # '-' = stdout
+    BACKEND_HOST = os.getenv('BACKEND_HOST', '0.0.0.0')
+    BACKEND_PORT = int(os.getenv('BACKEND_PORT', '6021'))
+    
+    # Password hashing (0 workers = hash inline in the request thread).
+    # Pools are per server worker, so the default splits the cores between them.
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '0')) or None  # None = Werkzeug default
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(max(1, (os.cpu_count() or 1) // SERVER_WORKERS))))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', '0')) or None  # None = 4 x workers
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '5'))
+    
+    # Invite expiry sweeper (0 = no background thread; use `flask sweep-invites`)
+    INVITE_SWEEP_INTERVAL = float(os.getenv('INVITE_SWEEP_INTERVAL', '0'))
+    INVITE_SWEEP_BATCH_SIZE = int(os.getenv('INVITE_SWEEP_BATCH_SIZE', '1000'))
+    # serve.py: the worker holding this lock is the one that sweeps
+    INVITE_SWEEP_LOCK_FILE = os.getenv('INVITE_SWEEP_LOCK_FILE',
+                                       os.path.join(tempfile.gettempdir(), 'nexus-invite-sweep.lock'))
+    
+    # List endpoint result cache: local, redis or none (local is per process;
+    # serve.py turns it off when running more than one worker)
+    RESULT_CACHE_BACKEND = os.getenv('RESULT_CACHE_BACKEND', 'local')
+    RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', '30'))
+    RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '512'))
+    RESULT_CACHE_REDIS_URL = os.getenv('RESULT_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Prometheus instrumentation served at /metrics
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    
+    # X-Query-Count debug header and N+1 warnings (repeats of one statement shape)
+    QUERY_COUNT_HEADER = os.getenv('QUERY_COUNT_HEADER', 'false').lower() in ('1', 'true', 'yes')
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '3'))
 
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
+    QUERY_COUNT_HEADER = os.getenv('QUERY_COUNT_HEADER', 'true').lower() in ('1', 'true', 'yes')
 
 
 class ProductionConfig(Config):
@@ -52,7 +95,9 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    PASSWORD_HASH_ITERATIONS = 1000
+    PASSWORD_HASH_WORKERS = 0
 
 
 # Configuration dictionary
@@ -64,7 +109,7 @@ config = {
 }
 
 
-def get_config():
-    """Get configuration based on environment."""
-    env = os.getenv('FLASK_ENV', 'development')
+def get_config(config_name=None):
+    """Get configuration by name, or based on environment."""
+    env = config_name or os.getenv('FLASK_ENV', 'development')
     return config.get(env, config['default'])
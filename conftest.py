@@ -0,0 +1,41 @@
+"""Shared pytest fixtures: a TestingConfig app on a fresh in-memory database."""
+
+import os
+import sys
+
+import pytest
+
+# Run from anywhere: the app imports its packages from the project root
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+os.environ.setdefault('FLASK_ENV', 'testing')
+# Cached responses would hide the SQL the tests look at
+os.environ.setdefault('RESULT_CACHE_BACKEND', 'none')
+
+# query_budget fixture: per-endpoint SQL budgets and N+1 detection
+pytest_plugins = ['utils.query_budget']
+
+
+@pytest.fixture
+def app():
+    from app import create_app
+    from models import db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    return {'X-Internal-Key': app.config['INTERNAL_API_KEY']}
@@ -0,0 +1,49 @@
+"""add users.org_path
+
+Revision ID: 8b4e6d2f1c35
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 19:11:00.000000
+
+Existing rows get their paths from manager_id during the upgrade; users
+in a manager_id cycle (or deeper than 50 levels) stay NULL.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# Mirrors MAX_ORG_DEPTH in models/org_tree.py
+MAX_ORG_DEPTH = 50
+
+BACKFILL_ORG_PATHS = f'''
+WITH RECURSIVE tree(id, path, depth) AS (
+    SELECT id, CAST('/' AS TEXT), 1 FROM users WHERE manager_id IS NULL
+    UNION ALL
+    SELECT users.id, tree.path || CAST(tree.id AS TEXT) || '/', tree.depth + 1
+    FROM users JOIN tree ON users.manager_id = tree.id
+    WHERE tree.depth < {MAX_ORG_DEPTH}
+)
+UPDATE users SET org_path = (SELECT tree.path FROM tree WHERE tree.id = users.id)
+WHERE id IN (SELECT id FROM tree)
+'''
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d2f1c35'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('org_path', sa.String(length=1024), nullable=True))
+        batch_op.create_index('ix_users_org_path', ['org_path'], unique=False)
+
+    op.execute(BACKFILL_ORG_PATHS)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_org_path')
+        batch_op.drop_column('org_path')
@@ -0,0 +1,43 @@
+"""add indexes for route query patterns
+
+Revision ID: c7a9e3b15d42
+Revises: 8b4e6d2f1c35
+Create Date: 2026-10-18 19:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a9e3b15d42'
+down_revision = '8b4e6d2f1c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_role_id', ['role', 'id'], unique=False)
+        batch_op.create_index('ix_users_manager_id', ['manager_id'], unique=False)
+        batch_op.create_index('ix_users_department', ['department'], unique=False)
+        # Rebuilt with pattern ops so prefix LIKE on the path can use it in Postgres
+        batch_op.drop_index('ix_users_org_path')
+        batch_op.create_index('ix_users_org_path', ['org_path'], unique=False, postgresql_ops={'org_path': 'varchar_pattern_ops'})
+
+    with op.batch_alter_table('invite_codes', schema=None) as batch_op:
+        batch_op.create_index('ix_invite_codes_manager_id_is_active', ['manager_id', 'is_active'], unique=False)
+        batch_op.create_index('ix_invite_codes_active_expires_at', ['expires_at'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+
+
+def downgrade():
+    with op.batch_alter_table('invite_codes', schema=None) as batch_op:
+        batch_op.drop_index('ix_invite_codes_active_expires_at', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+        batch_op.drop_index('ix_invite_codes_manager_id_is_active')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_org_path', postgresql_ops={'org_path': 'varchar_pattern_ops'})
+        batch_op.create_index('ix_users_org_path', ['org_path'], unique=False)
+        batch_op.drop_index('ix_users_department')
+        batch_op.drop_index('ix_users_manager_id')
+        batch_op.drop_index('ix_users_role_id')
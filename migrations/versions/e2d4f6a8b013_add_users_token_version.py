@@ -0,0 +1,26 @@
+"""add users.token_version
+
+Revision ID: e2d4f6a8b013
+Revises: c7a9e3b15d42
+Create Date: 2026-10-18 19:24:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2d4f6a8b013'
+down_revision = 'c7a9e3b15d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -3,6 +3,7 @@
 from models.user import User
 from models.invite_code import InviteCode
 from models.database import db
+from models import org_tree
 
 
 __all__ = ['User', 'db','InviteCode']
@@ -1,5 +1,89 @@
 """Database configuration and initialization."""
 
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
+
+# Same statement shape this many times in one request = likely N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+_local = threading.local()
+_PARAM = re.compile(r'%\(\w+\)s|:\w+|\$\d+')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACE = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    """Normalize a statement so executions differing only in values compare equal."""
+    shape = _PARAM.sub('?', statement)
+    shape = _IN_LIST.sub('(?)', shape)
+    shape = _NUMBER.sub('N', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class QueryLog:
+    """Statements executed in one thread while record_queries() is active."""
+
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """
+        Statement shapes executed at least ``threshold`` times.
+
+        Returns:
+            list: (shape, count) pairs, most repeated first
+        """
+        counts = Counter(statement_shape(s) for s in self.statements)
+        return [(shape, count) for shape, count in counts.most_common() if count >= threshold]
+
+    def report(self):
+        return '\n'.join(f'{i + 1:3d}. {s}' for i, s in enumerate(self.statements))
+
+
+@contextmanager
+def record_queries():
+    """
+    Collect the SQL statements the current thread executes.
+
+    Only engines passed to instrument_engine() are seen; create_app does
+    that for every Flask-SQLAlchemy engine. Recorders nest.
+
+    Yields:
+        QueryLog: Filled in as statements run
+    """
+    log = QueryLog()
+    logs = _local.__dict__.setdefault('logs', [])
+    logs.append(log)
+    try:
+        yield log
+    finally:
+        logs.remove(log)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The engine's only before_cursor_execute hook; utils/metrics.py times
+    # statements from this stamp in its after_cursor_execute hook
+    conn.info['query_start'] = time.perf_counter()
+    logs = getattr(_local, 'logs', None)
+    if logs:
+        for log in logs:
+            log.statements.append(statement)
+            log.parameters.append(parameters)
+
+
+def instrument_engine(engine):
+    """Attach the query recorder and start stamp to an engine (idempotent)."""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
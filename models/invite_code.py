@@ -1,6 +1,7 @@
 # models/invite_code.py
 from models.database import db
 from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
 import secrets
 import string
 
@@ -18,6 +19,17 @@ class InviteCode(db.Model):
     used_at = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
 
+    __table_args__ = (
+        db.Index('ix_invite_codes_manager_id_is_active', 'manager_id', 'is_active'),
+        # Partial index over live codes only; "unexpired" cannot be part of the
+        # predicate (now() is not immutable), so it is the leading key instead.
+        db.Index(
+            'ix_invite_codes_active_expires_at', 'expires_at',
+            postgresql_where=db.text('is_active'),
+            sqlite_where=db.text('is_active = 1')
+        ),
+    )
+
     # Relationships
     manager = db.relationship('User', foreign_keys=[manager_id], backref='invite_codes')
     used_by_user = db.relationship('User', foreign_keys=[used_by])
@@ -27,6 +39,28 @@ class InviteCode(db.Model):
         chars = string.ascii_uppercase + string.digits
         return ''.join(secrets.choice(chars) for _ in range(length))
 
+    @classmethod
+    def redeemable_clause(cls, now=None):
+        """SQL version of is_valid(): active, unexpired and under max_uses."""
+        now = now or datetime.utcnow()
+        return and_(
+            cls.is_active == True,  # '=' (not IS) so the partial index applies
+            or_(cls.expires_at.is_(None), cls.expires_at > now),
+            or_(cls.max_uses.is_(None), cls.max_uses == 0, cls.used_count < cls.max_uses)
+        )
+
+    @classmethod
+    def stale_clause(cls, now=None):
+        """SQL condition for codes still flagged active but expired or used up."""
+        now = now or datetime.utcnow()
+        return and_(
+            cls.is_active == True,
+            or_(
+                cls.expires_at <= now,
+                and_(cls.max_uses > 0, cls.used_count >= cls.max_uses)
+            )
+        )
+
     def is_valid(self):
         if not self.is_active:
             return False
@@ -36,16 +70,25 @@ class InviteCode(db.Model):
             return False
         return True
 
+    @staticmethod
+    def display_name(first_name, last_name, email):
+        return f"{first_name or ''} {last_name or ''}".strip() or email
+
+    @staticmethod
+    def link_for(code):
+        return f"http://127.0.0.1:5001/register?code={code}"
+
     def to_dict(self):
+        manager = self.manager
         return {
             'id': self.id,
             'code': self.code,
             'manager_id': self.manager_id,
-            'manager_name': f"{self.manager.first_name or ''} {self.manager.last_name or ''}".strip() or self.manager.email,
+            'manager_name': self.display_name(manager.first_name, manager.last_name, manager.email),
             'created_at': self.created_at.isoformat(),
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
             'max_uses': self.max_uses,
             'used_count': self.used_count,
             'is_active': self.is_active,
-            'invite_link': f"http://127.0.0.1:5001/register?code={self.code}"
+            'invite_link': self.link_for(self.code)
         }
\ No newline at end of file
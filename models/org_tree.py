@@ -0,0 +1,186 @@
+"""Org hierarchy queries and materialized-path maintenance."""
+
+from sqlalchemy import String, cast, event, func, literal, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import get_history
+from models.database import db
+from models.user import User
+
+# Guards recursive queries against manager_id cycles
+MAX_ORG_DEPTH = 50
+
+
+def get_reports(user_id, max_depth=None):
+    """
+    Everyone reporting (directly or not) to a user, in one statement.
+    
+    Uses the materialized path when the root has one, no depth limit is
+    requested and no user is left without a path (a NULL path would hide
+    that user and their reports from the prefix match). Otherwise a
+    recursive CTE walks manager_id downwards.
+    
+    Returns:
+        list: (User, depth) tuples ordered by depth, 1 = direct report
+    """
+    if max_depth is None:
+        unindexed = aliased(User)
+        row = db.session.execute(
+            select(
+                User.org_path,
+                select(unindexed.id).where(unindexed.org_path.is_(None)).exists()
+            ).where(User.id == user_id)
+        ).first()
+        if row is not None and row[0] is not None and not row[1]:
+            return _get_reports_by_path(user_id, row[0])
+    
+    limit = min(max_depth or MAX_ORG_DEPTH, MAX_ORG_DEPTH)
+    
+    tree = (
+        select(User.id.label('id'), literal(1).label('depth'))
+        .where(User.manager_id == user_id)
+        .cte('reports', recursive=True)
+    )
+    child = aliased(User)
+    tree = tree.union_all(
+        select(child.id, tree.c.depth + 1)
+        .where(child.manager_id == tree.c.id, tree.c.depth < limit)
+    )
+    
+    stmt = (
+        select(User, tree.c.depth)
+        .join(tree, User.id == tree.c.id)
+        .order_by(tree.c.depth, User.id)
+    )
+    return [(user, depth) for user, depth in db.session.execute(stmt)]
+
+
+def get_chain(user_id):
+    """
+    A user's management chain up to the top, in one statement.
+    
+    Returns:
+        list: (User, level) tuples, 1 = direct manager
+    """
+    tree = (
+        select(User.manager_id.label('id'), literal(1).label('level'))
+        .where(User.id == user_id)
+        .cte('chain', recursive=True)
+    )
+    parent = aliased(User)
+    tree = tree.union_all(
+        select(parent.manager_id, tree.c.level + 1)
+        .where(parent.id == tree.c.id, tree.c.level < MAX_ORG_DEPTH)
+    )
+    
+    stmt = (
+        select(User, tree.c.level)
+        .join(tree, User.id == tree.c.id)
+        .order_by(tree.c.level)
+    )
+    return [(user, level) for user, level in db.session.execute(stmt)]
+
+
+def rebuild_org_paths():
+    """
+    Recompute org_path for every user from manager_id.
+    
+    Returns:
+        int: Number of users updated
+    """
+    managers = dict(db.session.execute(select(User.id, User.manager_id)).all())
+    paths = {}
+    
+    def path_of(user_id):
+        if user_id not in paths:
+            chain, current = [], managers.get(user_id)
+            while current is not None and current not in chain and len(chain) < MAX_ORG_DEPTH:
+                chain.append(current)
+                current = managers.get(current)
+            paths[user_id] = '/' + ''.join(f'{m}/' for m in reversed(chain))
+        return paths[user_id]
+    
+    rows = [{'id': user_id, 'org_path': path_of(user_id)} for user_id in managers]
+    if rows:
+        db.session.execute(update(User), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _get_reports_by_path(user_id, root_path):
+    prefix = f'{root_path}{user_id}/'
+    base_depth = prefix.count('/')
+    users = (
+        User.query
+        .filter(User.org_path.like(prefix + '%'))
+        .order_by(func.length(User.org_path), User.id)
+        .all()
+    )
+    return [(user, user.org_path.count('/') - base_depth + 1) for user in users]
+
+
+def _path_under(connection, manager_id):
+    """org_path for a user placed under manager_id (None if unknown)."""
+    if manager_id is None:
+        return '/'
+    manager_path = connection.execute(
+        select(User.org_path).where(User.id == manager_id)
+    ).scalar()
+    return f'{manager_path}{manager_id}/' if manager_path is not None else None
+
+
+@event.listens_for(User, 'before_insert')
+def _set_org_path_on_insert(mapper, connection, target):
+    target.org_path = _path_under(connection, target.manager_id)
+
+
+@event.listens_for(User, 'before_update')
+def _move_subtree_on_manager_change(mapper, connection, target):
+    if not get_history(target, 'manager_id').has_changes():
+        return
+    
+    old_path = target.org_path
+    new_path = _path_under(connection, target.manager_id)
+    target.org_path = new_path
+    
+    users = User.__table__
+    if old_path is None:
+        # Descendants were never indexed, so there is no prefix to rewrite
+        if new_path is not None:
+            _fill_subtree_paths(connection, target.id, f'{new_path}{target.id}/')
+        return
+    
+    # Re-prefix the whole subtree in one statement
+    old_prefix = f'{old_path}{target.id}/'
+    if new_path is None:
+        new_value = None
+    else:
+        new_value = literal(f'{new_path}{target.id}/') + func.substr(users.c.org_path, len(old_prefix) + 1)
+    connection.execute(
+        update(users)
+        .where(users.c.org_path.like(old_prefix + '%'))
+        .values(org_path=new_value)
+    )
+
+
+def _fill_subtree_paths(connection, root_id, root_prefix):
+    """Set org_path below root_id from manager_id, in one recursive UPDATE."""
+    users = User.__table__
+    tree = (
+        select(
+            users.c.id.label('id'),
+            cast(literal(root_prefix), String).label('path'),
+            literal(1).label('depth')
+        )
+        .where(users.c.manager_id == root_id)
+        .cte('subtree', recursive=True)
+    )
+    child = users.alias('child')
+    tree = tree.union_all(
+        select(child.c.id, tree.c.path + cast(tree.c.id, String) + '/', tree.c.depth + 1)
+        .where(child.c.manager_id == tree.c.id, tree.c.depth < MAX_ORG_DEPTH)
+    )
+    connection.execute(
+        update(users)
+        .where(users.c.id == tree.c.id)
+        .values(org_path=tree.c.path)
+    )
@@ -0,0 +1,65 @@
+"""Row serializers that build response dicts straight from column tuples.
+
+List endpoints select plain columns instead of ORM entities and turn each
+row into a dict with these functions, skipping identity-map bookkeeping
+and attribute instrumentation per row. Dates are left as date/datetime
+objects; the app's JSON provider renders them as ISO 8601, so the output
+matches the models' to_dict().
+"""
+
+from models.user import User
+from models.invite_code import InviteCode
+
+
+def user_columns(fields=User.SERIALIZABLE_FIELDS):
+    """Columns to select for a list of User field names."""
+    return [getattr(User, field) for field in fields]
+
+
+def user_row_serializer(fields=User.SERIALIZABLE_FIELDS):
+    """
+    Compile a serializer for rows of ``select(*user_columns(fields))``.
+    
+    Returns:
+        function: row -> dict keyed by field name
+    """
+    names = tuple(fields)
+    
+    def serialize(row):
+        return dict(zip(names, row))
+    
+    return serialize
+
+
+# Invite columns plus the manager fields needed for manager_name
+INVITE_COLUMNS = (
+    InviteCode.id,
+    InviteCode.code,
+    InviteCode.manager_id,
+    InviteCode.created_at,
+    InviteCode.expires_at,
+    InviteCode.max_uses,
+    InviteCode.used_count,
+    InviteCode.is_active,
+    User.first_name,
+    User.last_name,
+    User.email,
+)
+
+
+def invite_row_to_dict(row):
+    """Serialize a row of ``select(*INVITE_COLUMNS)`` joined to the manager."""
+    (invite_id, code, manager_id, created_at, expires_at, max_uses,
+     used_count, is_active, first_name, last_name, email) = row
+    return {
+        'id': invite_id,
+        'code': code,
+        'manager_id': manager_id,
+        'manager_name': InviteCode.display_name(first_name, last_name, email),
+        'created_at': created_at,
+        'expires_at': expires_at,
+        'max_uses': max_uses,
+        'used_count': used_count,
+        'is_active': is_active,
+        'invite_link': InviteCode.link_for(code)
+    }
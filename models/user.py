@@ -1,8 +1,8 @@
 """User model for authentication and authorization."""
 
-from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from datetime import date, datetime
 from models.database import db
+from utils.password_hasher import password_hasher
 
 
 class User(db.Model):
@@ -25,10 +25,33 @@ class User(db.Model):
     # Work information
     department = db.Column(db.String(100))
     manager_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    # Materialized path of ancestor ids, e.g. '/1/5/' (top level: '/').
+    # Maintained by models/org_tree.py; `flask rebuild-org-paths` recomputes it.
+    org_path = db.Column(db.String(1024))
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped when the role or email changes or tokens are revoked; access
+    # tokens carry the version they were issued with (see /users/token-versions)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Secondary indexes for the route query patterns
+    __table_args__ = (
+        db.Index('ix_users_role_id', 'role', 'id'),
+        db.Index('ix_users_manager_id', 'manager_id'),
+        db.Index('ix_users_department', 'department'),
+        # Pattern ops so prefix LIKE on the path can use the index in Postgres
+        db.Index('ix_users_org_path', 'org_path', postgresql_ops={'org_path': 'varchar_pattern_ops'}),
+    )
+    
+    # Serialization
+    PUBLIC_FIELDS = (
+        'id', 'email', 'role', 'first_name', 'last_name',
+        'department', 'manager_id', 'created_at'
+    )
+    SENSITIVE_FIELDS = ('address', 'date_of_birth')
+    SERIALIZABLE_FIELDS = PUBLIC_FIELDS + SENSITIVE_FIELDS
     
     # Relationships
     employees = db.relationship(
@@ -39,28 +62,35 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set the user's password."""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify the user's password."""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.check(self.password_hash, password)
+    
+    def bump_token_version(self):
+        """Invalidate access tokens issued before this change."""
+        self.token_version = (self.token_version or 0) + 1
     
-    def to_dict(self, include_sensitive=False):
-        """Convert user object to dictionary."""
-        data = {
-            'id': self.id,
-            'email': self.email,
-            'role': self.role,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'department': self.department,
-            'manager_id': self.manager_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    def to_dict(self, include_sensitive=False, fields=None):
+        """
+        Convert user object to dictionary.
+        
+        Args:
+            include_sensitive (bool): Include address and date of birth
+            fields (iterable): Explicit subset of SERIALIZABLE_FIELDS to emit.
+                Only these attributes are touched, so columns deferred with
+                load_only() are never lazy-loaded.
+        """
+        if fields is None:
+            fields = self.PUBLIC_FIELDS + (self.SENSITIVE_FIELDS if include_sensitive else ())
         
-        if include_sensitive:
-            data['address'] = self.address
-            data['date_of_birth'] = self.date_of_birth.isoformat() if self.date_of_birth else None
+        data = {}
+        for field in fields:
+            value = getattr(self, field)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            data[field] = value
         
         return data
     
@@ -1,12 +1,26 @@
 """Invite code management routes (Data Service)."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
-from models import InviteCode, db
+from sqlalchemy import and_, case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from models import InviteCode, User, db
+from models.serializers import INVITE_COLUMNS, invite_row_to_dict
 from utils.decorators import require_api_key
+from utils.validators import parse_datetime
+from utils.etag import compute_etag, conditional_response
+from utils.result_cache import result_cache
 
 invites_bp = Blueprint('invites', __name__, url_prefix='/invites')
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_INVITES = 10000
+BATCH_INSERT_SIZE = 1000
+MAX_CODE_ATTEMPTS = 5
+MAX_EXPIRY_DAYS = 3650
+
 
 @invites_bp.route('/', methods=['POST'])
 @require_api_key
@@ -43,21 +57,250 @@ def create_invite():
         return jsonify(status=500, message=str(e)), 500
 
 
+@invites_bp.route('/batch', methods=['POST'])
+@require_api_key
+def create_invites_batch():
+    """
+    Issue many invite codes in one request.
+    
+    Body::
+    
+        {"manager_ids": [3, 7], "count": 50, "max_uses": 1,
+         "expires_at": "2026-12-31T00:00:00"}
+    
+    ``count`` codes are generated for each manager (``manager_id`` is accepted
+    for a single one; ``expires_in_days`` instead of ``expires_at``). All rows
+    go in with bulk INSERTs of BATCH_INSERT_SIZE inside one transaction.
+    Codes that already exist are found with one IN query per batch and only
+    those rows get new codes, so a collision never fails the request.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify(status=400, message='A JSON object is required'), 400
+        
+        manager_ids = data.get('manager_ids')
+        if manager_ids is None and 'manager_id' in data:
+            manager_ids = [data['manager_id']]
+        if (not isinstance(manager_ids, list) or not manager_ids
+                or not all(isinstance(m, int) and not isinstance(m, bool) for m in manager_ids)):
+            return jsonify(status=400, message='manager_ids must be a non-empty list of integers'), 400
+        manager_ids = list(dict.fromkeys(manager_ids))
+        
+        count = data.get('count', 1)
+        max_uses = data.get('max_uses', 1)
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            return jsonify(status=400, message='count must be a positive integer'), 400
+        if max_uses is not None and (not isinstance(max_uses, int) or isinstance(max_uses, bool) or max_uses < 0):
+            return jsonify(status=400, message='max_uses must be a non-negative integer or null'), 400
+        if count * len(manager_ids) > MAX_BATCH_INVITES:
+            return jsonify(status=400, message=f'At most {MAX_BATCH_INVITES} codes per request'), 400
+        
+        now = datetime.utcnow()
+        if data.get('expires_in_days') is not None:
+            days = data['expires_in_days']
+            if isinstance(days, bool) or not isinstance(days, (int, float)) or not 0 < days <= MAX_EXPIRY_DAYS:
+                return jsonify(status=400, message=f'expires_in_days must be a number between 0 and {MAX_EXPIRY_DAYS}'), 400
+            try:
+                expires_at = now + timedelta(days=days)
+            except (OverflowError, ValueError):
+                return jsonify(status=400, message='expires_in_days is out of range'), 400
+        else:
+            expires_at, error = parse_datetime(data.get('expires_at'))
+            if error:
+                return jsonify(status=400, message=error), 400
+        if expires_at is not None and expires_at <= now:
+            return jsonify(status=400, message='Expiry must be in the future'), 400
+        
+        known = set(db.session.scalars(select(User.id).where(User.id.in_(manager_ids))))
+        unknown = [m for m in manager_ids if m not in known]
+        if unknown:
+            return jsonify(status=404, message=f'Managers not found: {unknown}'), 404
+        
+        rows = [
+            {'manager_id': manager_id, 'created_at': now, 'expires_at': expires_at,
+             'max_uses': max_uses, 'used_count': 0, 'is_active': True}
+            for manager_id in manager_ids for _ in range(count)
+        ]
+        
+        regenerated = _insert_with_unique_codes(rows)
+        if regenerated is None:
+            db.session.rollback()
+            return jsonify(status=409, message='Could not generate unique codes, nothing was created'), 409
+        
+        db.session.commit()
+        
+        return jsonify(
+            status=201,
+            message='Invite codes created',
+            summary={'created': len(rows), 'managers': len(manager_ids), 'regenerated': regenerated},
+            data=[{
+                'code': row['code'],
+                'manager_id': row['manager_id'],
+                'expires_at': expires_at.isoformat() if expires_at else None,
+                'max_uses': max_uses,
+                'invite_link': InviteCode.link_for(row['code'])
+            } for row in rows]
+        ), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(status=500, message=str(e)), 500
+
+
+def _insert_with_unique_codes(rows):
+    """
+    Give each row a fresh code and bulk insert them.
+    
+    Only rows whose code is already taken are regenerated: up front with an
+    IN query, and again if a concurrent insert wins a code between the check
+    and the INSERT (the INSERT runs in a savepoint, so only it is undone).
+    
+    Returns:
+        int or None: Number of regenerated codes, None after MAX_CODE_ATTEMPTS
+    """
+    issued = set()
+    pending = rows
+    regenerated = 0
+    
+    for _ in range(MAX_CODE_ATTEMPTS):
+        repeats = []
+        for row in pending:
+            row['code'] = InviteCode.generate_code()
+            # A code issued earlier in this batch collides as well
+            repeats.append(row['code'] in issued)
+            issued.add(row['code'])
+        
+        taken = _taken_codes([row['code'] for row in pending])
+        pending = [row for row, repeat in zip(pending, repeats) if repeat or row['code'] in taken]
+        regenerated += len(pending)
+        if pending:
+            continue
+        
+        try:
+            with db.session.begin_nested():
+                for start in range(0, len(rows), BATCH_INSERT_SIZE):
+                    db.session.execute(insert(InviteCode), rows[start:start + BATCH_INSERT_SIZE])
+            return regenerated
+        except IntegrityError:
+            taken = _taken_codes([row['code'] for row in rows])
+            pending = [row for row in rows if row['code'] in taken]
+            regenerated += len(pending)
+            if not pending:
+                raise
+    
+    return None
+
+
+def _taken_codes(codes):
+    """Codes that already exist, one IN query per BATCH_INSERT_SIZE codes."""
+    taken = set()
+    for start in range(0, len(codes), BATCH_INSERT_SIZE):
+        taken.update(db.session.scalars(
+            select(InviteCode.code).where(InviteCode.code.in_(codes[start:start + BATCH_INSERT_SIZE]))
+        ))
+    return taken
+
+
+@invites_bp.route('/', methods=['GET'])
+@require_api_key
+@result_cache.cached_view('invites')
+def list_invites():
+    """
+    List invite codes, paginated by id.
+    
+    Query parameters:
+        manager_id: Only invites issued by this manager
+        active: true/false to filter on is_active
+        limit / after: Keyset pagination on id (pass next_cursor as after)
+    
+    The manager is joined in the same query, so a page costs one statement.
+    """
+    try:
+        try:
+            manager_id = int(request.args['manager_id']) if request.args.get('manager_id') else None
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            after = int(request.args['after']) if request.args.get('after') else None
+        except ValueError:
+            return jsonify(status=400, message='manager_id, limit and after must be integers'), 400
+        
+        if limit < 1:
+            return jsonify(status=400, message='limit must be positive'), 400
+        limit = min(limit, MAX_PAGE_SIZE)
+        
+        filters = []
+        if manager_id is not None:
+            filters.append(InviteCode.manager_id == manager_id)
+        
+        active = request.args.get('active')
+        if active is not None:
+            filters.append(InviteCode.is_active == (active.lower() in ('1', 'true', 'yes')))
+        
+        # Collection version: redemptions, deactivations and manager renames all move it
+        version = db.session.execute(
+            select(
+                func.count(InviteCode.id),
+                func.max(InviteCode.id),
+                func.sum(InviteCode.used_count),
+                func.sum(case((InviteCode.is_active == True, 1), else_=0)),
+                func.max(InviteCode.used_at),
+                func.max(User.updated_at),
+            ).join(User, User.id == InviteCode.manager_id).where(*filters)
+        ).one()
+        
+        def build():
+            # Plain column rows with the manager joined in, no ORM objects
+            stmt = select(*INVITE_COLUMNS).join(User, User.id == InviteCode.manager_id).where(*filters)
+            
+            if after is not None:
+                stmt = stmt.where(InviteCode.id > after)
+            
+            # Fetch one extra row to know whether another page exists
+            rows = db.session.execute(stmt.order_by(InviteCode.id).limit(limit + 1)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
+            return jsonify(
+                status=200,
+                message='Invite codes retrieved',
+                data=[invite_row_to_dict(row) for row in rows],
+                next_cursor=rows[-1].id if has_more else None
+            ), 200
+        
+        return conditional_response(compute_etag(*version), build)
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
 @invites_bp.route('/<code>', methods=['GET'])
 @require_api_key
 def get_invite(code):
-    """Get invite code details."""
+    """
+    Get invite code details.
+    
+    With ``?active=true`` only a currently redeemable code is returned
+    (checked in SQL); expired or used-up codes give 404.
+    """
     try:
-        invite = InviteCode.query.filter_by(code=code).first()
+        stmt = select(
+            InviteCode.id, InviteCode.used_count, InviteCode.is_active,
+            InviteCode.used_at, InviteCode.expires_at, User.updated_at
+        ).join(User, User.id == InviteCode.manager_id).where(InviteCode.code == code)
         
-        if not invite:
+        if request.args.get('active', '').lower() in ('1', 'true', 'yes'):
+            stmt = stmt.where(InviteCode.redeemable_clause())
+        
+        version = db.session.execute(stmt).first()
+        
+        if not version:
             return jsonify(status=404, message='Invite code not found'), 404
             
-        return jsonify(
+        return conditional_response(compute_etag(*version), lambda: (jsonify(
             status=200,
             message='Invite code retrieved',
-            data=invite.to_dict()
-        ), 200
+            data=db.session.get(InviteCode, version.id, options=[joinedload(InviteCode.manager)]).to_dict()
+        ), 200))
         
     except Exception as e:
         return jsonify(status=500, message=str(e)), 500
@@ -66,33 +309,53 @@ def get_invite(code):
 @invites_bp.route('/<code>/use', methods=['POST'])
 @require_api_key
 def use_invite(code):
-    """Mark invite code as used."""
+    """
+    Mark invite code as used.
+    
+    Redemption is a single conditional UPDATE ... RETURNING: the row is only
+    touched while it is active, unexpired and under max_uses, so concurrent
+    redemptions can never over-use a code.
+    """
     try:
-        invite = InviteCode.query.filter_by(code=code).first()
+        data = request.get_json(silent=True) or {}
+        used_by_id = data.get('used_by_id')
+        now = datetime.utcnow()
+        
+        exhausted = and_(
+            InviteCode.max_uses.isnot(None),
+            InviteCode.max_uses > 0,
+            InviteCode.used_count + 1 >= InviteCode.max_uses
+        )
+        
+        stmt = (
+            update(InviteCode)
+            .where(InviteCode.code == code, InviteCode.redeemable_clause(now))
+            .values(
+                used_count=InviteCode.used_count + 1,
+                used_at=now,
+                used_by=used_by_id if used_by_id else InviteCode.used_by,
+                is_active=case((exhausted, False), else_=InviteCode.is_active)
+            )
+            .returning(InviteCode)
+            .execution_options(synchronize_session=False)
+        )
+        
+        invite = db.session.execute(stmt).scalar_one_or_none()
         
         if not invite:
-            return jsonify(status=404, message='Invite code not found'), 404
-            
-        if not invite.is_valid():
+            db.session.rollback()
+            if not db.session.query(InviteCode.id).filter_by(code=code).first():
+                return jsonify(status=404, message='Invite code not found'), 404
             return jsonify(status=400, message='Invite code is invalid or expired'), 400
-            
-        data = request.get_json()
-        used_by_id = data.get('used_by_id')
         
-        invite.used_count += 1
-        invite.used_at = datetime.utcnow()
-        if used_by_id:
-            invite.used_by = used_by_id
-            
-        if invite.max_uses and invite.used_count >= invite.max_uses:
-            invite.is_active = False
-            
+        # Serialize before commit so the returned row is not re-fetched
+        result = invite.to_dict()
         db.session.commit()
         
         return jsonify(
             status=200,
             message='Invite code used successfully',
-            data=invite.to_dict()
+            data=result
         ), 200
         
     except Exception as e:
@@ -1,12 +1,30 @@
 """User management routes for CRUD operations (Data Service)."""
 
-from flask import Blueprint, request, jsonify
+import os
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from models import User, db
-from utils.validators import validate_email, validate_password
+from models.serializers import user_columns, user_row_serializer
+from models.org_tree import get_chain, get_reports
+from utils.validators import parse_date, validate_email, validate_password
 from utils.decorators import require_api_key
+from utils.password_hasher import HashQueueFull
+from utils.etag import compute_etag, conditional_response
+from utils.result_cache import result_cache
 
 users_bp = Blueprint('users', __name__, url_prefix='/users')
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_CHUNK_SIZE = 1000
+NDJSON_MIMETYPE = 'application/x-ndjson'
+MAX_BULK_USERS = 10000
+BULK_INSERT_BATCH_SIZE = 1000
+BULK_HASH_WORKERS = os.cpu_count() or 4
+BULK_STRING_FIELDS = ('role', 'first_name', 'last_name', 'address', 'department')
+
 
 @users_bp.route('/', methods=['POST'])
 @require_api_key
@@ -23,6 +41,10 @@ def create_user():
         
         if User.query.filter_by(email=email).first():
             return jsonify(status=409, message='Email already registered'), 409
+        
+        date_of_birth, error = parse_date(data.get('date_of_birth'))
+        if error:
+            return jsonify(status=400, message=error), 400
             
         # Create user directly
         new_user = User(
@@ -33,7 +55,7 @@ def create_user():
             address=data.get('address'),
             department=data.get('department'),
             manager_id=data.get('manager_id'),
-            date_of_birth=data.get('date_of_birth')
+            date_of_birth=date_of_birth
         )
         
         # Set password if provided (hashed)
@@ -49,30 +71,368 @@ def create_user():
             data=new_user.to_dict(include_sensitive=True)
         ), 201
         
+    except HashQueueFull:
+        db.session.rollback()
+        return jsonify(status=503, message='Password hashing is saturated, retry later'), 503
+    
     except Exception as e:
         db.session.rollback()
         return jsonify(status=500, message=str(e)), 500
 
 
+@users_bp.route('/bulk', methods=['POST'])
+@require_api_key
+def create_users_bulk():
+    """
+    Create many users in one request (Internal API).
+    
+    Body: ``{"users": [{...}, ...]}`` with the same fields as ``POST /users/``.
+    Duplicates are detected with one set-based query against the email
+    index, passwords are hashed in parallel and rows are inserted in
+    batches of BULK_INSERT_BATCH_SIZE inside a single transaction.
+    Returns a per-row report: created / duplicate / invalid.
+    """
+    try:
+        data = request.get_json()
+        records = data.get('users') if isinstance(data, dict) else None
+        
+        if not isinstance(records, list) or not records:
+            return jsonify(status=400, message='A non-empty "users" list is required'), 400
+        
+        if len(records) > MAX_BULK_USERS:
+            return jsonify(status=400, message=f'At most {MAX_BULK_USERS} users per request'), 400
+        
+        results = [None] * len(records)
+        candidates = []  # (index, record, email)
+        seen = set()
+        
+        # Validate and drop in-payload duplicates
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                results[index] = {'index': index, 'status': 'invalid', 'message': 'User record must be an object'}
+                continue
+            
+            # Anything but a string is reported on its row, not raised for the batch
+            email = record.get('email')
+            email = email.strip() if isinstance(email, str) else None
+            if not validate_email(email):
+                results[index] = {'index': index, 'email': email, 'status': 'invalid', 'message': 'Invalid email format'}
+                continue
+            
+            password = record.get('password')
+            if password is not None and not isinstance(password, str):
+                results[index] = {'index': index, 'email': email, 'status': 'invalid', 'message': 'Password must be a string'}
+                continue
+            
+            error = _bulk_field_error(record)
+            if error:
+                results[index] = {'index': index, 'email': email, 'status': 'invalid', 'message': error}
+                continue
+            
+            is_valid, error = validate_password(password)
+            if not is_valid:
+                results[index] = {'index': index, 'email': email, 'status': 'invalid', 'message': error}
+                continue
+            
+            date_of_birth, error = parse_date(record.get('date_of_birth'))
+            if error:
+                results[index] = {'index': index, 'email': email, 'status': 'invalid', 'message': error}
+                continue
+            record['date_of_birth'] = date_of_birth
+            
+            if email in seen:
+                results[index] = {'index': index, 'email': email, 'status': 'duplicate', 'message': 'Email repeated in request'}
+                continue
+            
+            seen.add(email)
+            candidates.append((index, record, email))
+        
+        # One set-based duplicate check against the email index
+        existing = set()
+        emails = [email for _, _, email in candidates]
+        for start in range(0, len(emails), BULK_INSERT_BATCH_SIZE):
+            chunk = emails[start:start + BULK_INSERT_BATCH_SIZE]
+            existing.update(
+                row.email for row in db.session.query(User.email).filter(User.email.in_(chunk))
+            )
+        
+        new_users = []  # (index, user)
+        for index, record, email in candidates:
+            if email in existing:
+                results[index] = {'index': index, 'email': email, 'status': 'duplicate', 'message': 'Email already registered'}
+                continue
+            
+            new_users.append((index, User(
+                email=email,
+                role=record.get('role', 'employee'),
+                first_name=record.get('first_name'),
+                last_name=record.get('last_name'),
+                address=record.get('address'),
+                department=record.get('department'),
+                manager_id=record.get('manager_id'),
+                date_of_birth=record.get('date_of_birth')
+            )))
+        
+        # Hash in parallel: each thread keeps one job in flight on the hashing service
+        with ThreadPoolExecutor(max_workers=BULK_HASH_WORKERS) as pool:
+            list(pool.map(
+                lambda item: item[1].set_password(records[item[0]]['password']),
+                new_users
+            ))
+        
+        # Batched inserts, single transaction
+        for start in range(0, len(new_users), BULK_INSERT_BATCH_SIZE):
+            db.session.add_all([user for _, user in new_users[start:start + BULK_INSERT_BATCH_SIZE]])
+            db.session.flush()
+        
+        db.session.commit()
+        
+        for index, user in new_users:
+            results[index] = {'index': index, 'email': user.email, 'status': 'created', 'id': user.id}
+        
+        summary = {status: sum(1 for r in results if r['status'] == status)
+                   for status in ('created', 'duplicate', 'invalid')}
+        
+        return jsonify(
+            status=200,
+            message='Bulk import processed',
+            summary=summary,
+            data=results
+        ), 200
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify(status=409, message='Email already registered (concurrent insert), nothing was created'), 409
+    
+    except HashQueueFull:
+        db.session.rollback()
+        return jsonify(status=503, message='Password hashing is saturated, retry later'), 503
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(status=500, message=str(e)), 500
+
+
+def _bulk_field_error(record):
+    """Type-check the optional columns of a bulk record; returns an error message or None."""
+    for field in BULK_STRING_FIELDS:
+        if record.get(field) is not None and not isinstance(record[field], str):
+            return f'{field} must be a string'
+    
+    manager_id = record.get('manager_id')
+    if manager_id is not None and (isinstance(manager_id, bool) or not isinstance(manager_id, int)):
+        return 'manager_id must be an integer'
+    return None
+
+
 @users_bp.route('/', methods=['GET'])
 @require_api_key
+@result_cache.cached_view('users')
 def get_all_users():
-    """Get all users (Internal API)."""
+    """
+    Get all users (Internal API).
+    
+    Query parameters:
+        role: Optional role filter
+        limit / after: Keyset pagination on id. Pass the returned
+            next_cursor as ``after`` to fetch the following page.
+            Without either parameter the full list is returned.
+        fields: Comma-separated subset of columns to select and return
+    """
     try:
+        # Sparse fieldsets: only select the requested columns
+        fields = User.SERIALIZABLE_FIELDS
+        if request.args.get('fields'):
+            fields = _parse_fields(request.args['fields'])
+            if fields is None:
+                return jsonify(
+                    status=400,
+                    message=f"Unknown field requested. Allowed: {', '.join(User.SERIALIZABLE_FIELDS)}"
+                ), 400
+        
+        paginated = 'limit' in request.args or 'after' in request.args
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            after = int(request.args['after']) if request.args.get('after') else None
+        except ValueError:
+            return jsonify(status=400, message='limit and after must be integers'), 400
+        
+        if limit < 1:
+            return jsonify(status=400, message='limit must be positive'), 400
+        limit = min(limit, MAX_PAGE_SIZE)
+        
         # Optional filtering by role
         role = request.args.get('role')
-        if role:
-            users = User.query.filter_by(role=role).all()
-        else:
-            users = User.query.all()
+        filters = [User.role == role] if role else []
+        
+        # Collection version: one aggregate, answered from the indexes
+        version = db.session.execute(
+            select(func.count(User.id), func.max(User.id), func.max(User.updated_at)).where(*filters)
+        ).one()
         
+        def build():
+            # Plain column rows, no ORM objects
+            stmt = select(*user_columns(fields)).where(*filters)
+            serialize = user_row_serializer(fields)
+            
+            if not paginated:
+                rows = db.session.execute(stmt).all()
+                return jsonify(
+                    status=200,
+                    message='Users retrieved successfully',
+                    data=[serialize(row) for row in rows]
+                ), 200
+            
+            if after is not None:
+                stmt = stmt.where(User.id > after)
+            
+            # Fetch one extra row to know whether another page exists
+            rows = db.session.execute(stmt.order_by(User.id).limit(limit + 1)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            
+            return jsonify(
+                status=200,
+                message='Users retrieved successfully',
+                data=[serialize(row) for row in rows],
+                next_cursor=rows[-1].id if has_more else None
+            ), 200
+        
+        return conditional_response(compute_etag(*version), build)
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
+def _parse_fields(raw):
+    """Parse a ``fields=`` value; returns None if any field is unknown."""
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    if any(f not in User.SERIALIZABLE_FIELDS for f in fields):
+        return None
+    # id is always returned: it is the pagination cursor
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+@users_bp.route('/export', methods=['GET'])
+@require_api_key
+def export_users():
+    """
+    Stream every user as NDJSON (Internal API).
+    
+    Rows are fetched from the database in chunks of EXPORT_CHUNK_SIZE
+    (server-side cursor where the driver supports it) and written one JSON
+    line per user, so memory stays flat regardless of the table size.
+    Accepts the same ``role`` and ``fields`` filters as ``GET /users/``.
+    Clients that do not accept NDJSON get a 406; use ``GET /users/`` with
+    ``limit``/``after`` for a paginated JSON listing.
+    """
+    # No Accept header means anything goes
+    accept = request.accept_mimetypes
+    if accept.provided and not accept.best_match([NDJSON_MIMETYPE]):
         return jsonify(
+            status=406,
+            message=f'Export is only available as {NDJSON_MIMETYPE}; use GET /users/ for paginated JSON'
+        ), 406
+    
+    fields = User.SERIALIZABLE_FIELDS
+    if request.args.get('fields'):
+        fields = _parse_fields(request.args['fields'])
+        if fields is None:
+            return jsonify(
+                status=400,
+                message=f"Unknown field requested. Allowed: {', '.join(User.SERIALIZABLE_FIELDS)}"
+            ), 400
+    
+    stmt = select(*user_columns(fields)).order_by(User.id)
+    serialize = user_row_serializer(fields)
+    
+    role = request.args.get('role')
+    if role:
+        stmt = stmt.where(User.role == role)
+    
+    stmt = stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    dumps = current_app.json.dumps
+    
+    def generate():
+        for row in db.session.execute(stmt):
+            yield dumps(serialize(row)) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+@users_bp.route('/by-email/<email>', methods=['GET'])
+@require_api_key
+def get_user_by_email(email):
+    """Get specific user details by email (Internal API)."""
+    try:
+        # Single indexed lookup on users.email instead of scanning the table
+        version = db.session.execute(
+            select(User.id, User.updated_at).where(User.email == email.strip())
+        ).first()
+        
+        if not version:
+            return jsonify(status=404, message='User not found'), 404
+        
+        return conditional_response(compute_etag(*version), lambda: (jsonify(
+            status=200,
+            message='User retrieved successfully',
+            data=db.session.get(User, version.id).to_dict(include_sensitive=True)
+        ), 200))
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
+@users_bp.route('/token-versions', methods=['GET'])
+@require_api_key
+def get_token_versions():
+    """
+    Token version stamps of users whose tokens were revoked (Internal API).
+    
+    Only users with a non-zero version are listed, so the table stays small;
+    callers cache it and revalidate with If-None-Match.
+    """
+    try:
+        rows = db.session.execute(
+            select(User.id, User.token_version)
+            .where(User.token_version > 0)
+            .order_by(User.id)
+        ).all()
+        versions = {str(user_id): token_version for user_id, token_version in rows}
+        
+        return conditional_response(compute_etag(*rows), lambda: (jsonify(
             status=200,
-            message='Users retrieved successfully',
-            data=[user.to_dict(include_sensitive=True) for user in users]
+            message='Token versions retrieved successfully',
+            data=versions
+        ), 200))
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
+@users_bp.route('/<int:user_id>/revoke-tokens', methods=['POST'])
+@require_api_key
+def revoke_user_tokens(user_id):
+    """Revoke every access token issued to a user so far (Internal API)."""
+    try:
+        user = db.session.get(User, user_id)
+        
+        if not user:
+            return jsonify(status=404, message='User not found'), 404
+        
+        user.bump_token_version()
+        db.session.commit()
+        
+        return jsonify(
+            status=200,
+            message='Tokens revoked successfully',
+            data={'id': user.id, 'token_version': user.token_version}
         ), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify(status=500, message=str(e)), 500
 
 
@@ -81,15 +441,71 @@ def get_all_users():
 def get_user(user_id):
     """Get specific user details (Internal API)."""
     try:
-        user = User.query.get(user_id)
+        version = db.session.execute(
+            select(User.id, User.updated_at).where(User.id == user_id)
+        ).first()
         
-        if not user:
+        if not version:
             return jsonify(status=404, message='User not found'), 404
         
-        return jsonify(
+        return conditional_response(compute_etag(*version), lambda: (jsonify(
             status=200,
             message='User retrieved successfully',
-            data=user.to_dict(include_sensitive=True)
+            data=db.session.get(User, user_id).to_dict(include_sensitive=True)
+        ), 200))
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
+@users_bp.route('/<int:user_id>/reports', methods=['GET'])
+@require_api_key
+def get_user_reports(user_id):
+    """
+    Get a manager's reporting tree (Internal API).
+    
+    Query parameters:
+        depth: Optional number of levels below the user (1 = direct reports)
+    """
+    try:
+        depth = request.args.get('depth')
+        try:
+            depth = int(depth) if depth else None
+        except ValueError:
+            return jsonify(status=400, message='depth must be an integer'), 400
+        
+        if depth is not None and depth < 1:
+            return jsonify(status=400, message='depth must be positive'), 400
+        
+        if not db.session.query(User.id).filter_by(id=user_id).first():
+            return jsonify(status=404, message='User not found'), 404
+        
+        reports = get_reports(user_id, depth)
+        
+        return jsonify(
+            status=200,
+            message='Reports retrieved successfully',
+            data=[dict(user.to_dict(), depth=level) for user, level in reports]
+        ), 200
+        
+    except Exception as e:
+        return jsonify(status=500, message=str(e)), 500
+
+
+@users_bp.route('/<int:user_id>/chain', methods=['GET'])
+@require_api_key
+def get_user_chain(user_id):
+    """Get a user's management chain up to the top (Internal API)."""
+    try:
+        if not db.session.query(User.id).filter_by(id=user_id).first():
+            return jsonify(status=404, message='User not found'), 404
+        
+        chain = get_chain(user_id)
+        
+        return jsonify(
+            status=200,
+            message='Management chain retrieved successfully',
+            data=[dict(user.to_dict(), level=level) for user, level in chain]
         ), 200
         
     except Exception as e:
@@ -112,10 +528,18 @@ def update_user(user_id):
         if 'first_name' in data: user.first_name = data['first_name']
         if 'last_name' in data: user.last_name = data['last_name']
         if 'address' in data: user.address = data['address']
-        if 'date_of_birth' in data: user.date_of_birth = data['date_of_birth']
+        if 'date_of_birth' in data:
+            date_of_birth, error = parse_date(data['date_of_birth'])
+            if error:
+                return jsonify(status=400, message=error), 400
+            user.date_of_birth = date_of_birth
         if 'department' in data: user.department = data['department']
-        if 'role' in data: user.role = data['role']
         if 'manager_id' in data: user.manager_id = data['manager_id']
+        
+        # Tokens carry role and email as claims; a change revokes them
+        if data.get('role', user.role) != user.role or data.get('email', user.email) != user.email:
+            user.bump_token_version()
+        if 'role' in data: user.role = data['role']
         if 'email' in data: user.email = data['email']
         
         if 'password' in data:
@@ -129,6 +553,10 @@ def update_user(user_id):
             data=user.to_dict(include_sensitive=True)
         ), 200
         
+    except HashQueueFull:
+        db.session.rollback()
+        return jsonify(status=503, message='Password hashing is saturated, retry later'), 503
+    
     except Exception as e:
         db.session.rollback()
         return jsonify(status=500, message=str(e)), 500
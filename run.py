@@ -13,8 +13,12 @@ if project_root not in sys.path:
 
 # Now import and run the app
 from app import app
+from utils.invite_sweeper import invite_sweeper
 
 if __name__ == '__main__':
+    # With the reloader on, only its serving child sweeps, not the watcher
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        invite_sweeper.start()
     app.run(
         host=app.config.get('HOST', '127.0.0.1'),
         port=app.config.get('PORT', 5001),
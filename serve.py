@@ -0,0 +1,180 @@
+"""
+Production server for Nexus and backend_app (Gunicorn, multi-process).
+
+    python serve.py nexus                  # Nexus API on HOST:PORT
+    python serve.py backend                # backend_app on BACKEND_HOST:BACKEND_PORT
+    python serve.py nexus --workers 8 --threads 2
+
+Defaults come from the SERVER_* settings in config/config.py; command-line
+options override them. With preloading the app is imported once in the
+master and forked, so workers share its code pages; database pools are
+reset in each child after the fork. The invite sweeper (INVITE_SWEEP_INTERVAL)
+runs in one worker at a time, the one holding INVITE_SWEEP_LOCK_FILE. The
+local result cache and the backend user cache cannot be invalidated across
+workers, so with more than one worker the first is disabled unless it uses
+Redis and the second is disabled.
+
+run.py and app.py keep starting the Werkzeug development server.
+"""
+
+import importlib.util
+import os
+import sys
+
+import click
+
+# Ensure project root is in Python path
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import get_config
+
+BACKEND_DIR = os.path.join(project_root, 'backend_app')
+
+
+def load_nexus(options):
+    from app import create_app
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    
+    if options['workers'] > 1 and app.config['RESULT_CACHE_BACKEND'] == 'local':
+        # A commit only invalidates the worker that handled it; the others would
+        # serve stale lists (and ETags) for up to RESULT_CACHE_TTL
+        from utils.result_cache import result_cache
+        click.echo('Warning: RESULT_CACHE_BACKEND=local is per process; result cache disabled '
+                   f"for {options['workers']} workers. Set RESULT_CACHE_BACKEND=redis to share it.", err=True)
+        app.config['RESULT_CACHE_BACKEND'] = 'none'
+        result_cache.init_app(app)
+    return app
+
+
+def load_backend(options):
+    # backend_app imports its packages as top-level modules and keeps its
+    # JSON stores relative to its own directory
+    os.chdir(BACKEND_DIR)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    spec = importlib.util.spec_from_file_location('backend_app_main', os.path.join(BACKEND_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    if options['workers'] > 1:
+        # Writes only invalidate the worker that made them; the others would keep
+        # stale roles and managers for up to USER_CACHE_TTL
+        from Helperes.userCache import identityCache
+        if identityCache.ttl > 0 and identityCache.maxSize > 0:
+            click.echo('Warning: the backend user cache is per process; disabled '
+                       f"for {options['workers']} workers.", err=True)
+            identityCache.disable()
+    return module.app
+
+
+def after_fork_nexus(app):
+    """Drop connections inherited from the master; each worker opens its own."""
+    from models import db
+    from utils.invite_sweeper import invite_sweeper
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # Every worker starts it; the one holding the lock file sweeps
+    invite_sweeper.start(app.config['INVITE_SWEEP_LOCK_FILE'])
+
+
+def on_exit_nexus(app):
+    from utils.invite_sweeper import invite_sweeper
+    from utils.password_hasher import password_hasher
+    invite_sweeper.stop()
+    password_hasher.shutdown()
+
+
+# load, post_fork, worker_exit
+SERVICES = {
+    'nexus': (load_nexus, after_fork_nexus, on_exit_nexus),
+    'backend': (load_backend, None, None),
+}
+
+
+def gunicorn_options(config, bind, **overrides):
+    """Translate SERVER_* settings (plus CLI overrides) into Gunicorn settings."""
+    settings = {
+        'workers': config.SERVER_WORKERS,
+        'threads': config.SERVER_THREADS,
+        'preload': config.SERVER_PRELOAD,
+        'keepalive': config.SERVER_KEEPALIVE,
+        'timeout': config.SERVER_TIMEOUT,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT,
+        'max_requests': config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': config.SERVER_MAX_REQUESTS_JITTER,
+    }
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+
+    return {
+        'bind': bind,
+        'workers': settings['workers'],
+        'threads': settings['threads'],
+        # gthread serves keep-alive connections; sync workers close after each request
+        'worker_class': 'gthread' if settings['threads'] > 1 else 'sync',
+        'preload_app': settings['preload'],
+        'keepalive': settings['keepalive'],
+        'timeout': settings['timeout'],
+        'graceful_timeout': settings['graceful_timeout'],
+        'max_requests': settings['max_requests'],
+        'max_requests_jitter': settings['max_requests_jitter'] if settings['max_requests'] else 0,
+        'accesslog': config.SERVER_ACCESS_LOG,
+        'errorlog': '-',
+    }
+
+
+def run(service, bind, options):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise click.ClickException('gunicorn is required for serve.py (pip install gunicorn)')
+
+    load, after_fork, on_exit = SERVICES[service]
+
+    class Application(BaseApplication):
+        def __init__(self):
+            self.application = None
+            super().__init__()
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+            if after_fork:
+                self.cfg.set('post_fork', lambda server, worker: after_fork(self.load()))
+            if on_exit:
+                self.cfg.set('worker_exit', lambda server, worker: on_exit(self.load()))
+
+        def load(self):
+            if self.application is None:
+                self.application = load(options)
+            return self.application
+
+    click.echo(f"Serving {service} on {bind}: {options['workers']} workers x {options['threads']} threads "
+               f"({options['worker_class']}), preload={options['preload_app']}")
+    Application().run()
+
+
+@click.command()
+@click.argument('service', type=click.Choice(sorted(SERVICES)))
+@click.option('--bind', help='host:port (default HOST:PORT or BACKEND_HOST:BACKEND_PORT from config)')
+@click.option('--workers', type=int, help='Worker processes.')
+@click.option('--threads', type=int, help='Threads per worker.')
+@click.option('--preload/--no-preload', default=None, help='Import the app once in the master before forking.')
+@click.option('--keepalive', type=int, help='Seconds to hold idle keep-alive connections.')
+@click.option('--timeout', type=int, help='Seconds before a stuck request/worker is killed and restarted.')
+@click.option('--graceful-timeout', type=int, help='Seconds workers get to finish requests on shutdown.')
+@click.option('--max-requests', type=int, help='Recycle a worker after this many requests (0 = never).')
+@click.option('--max-requests-jitter', type=int, help='Random extra requests so workers do not recycle together.')
+def main(service, bind, **overrides):
+    """Run SERVICE (nexus or backend) under Gunicorn."""
+    config = get_config(os.getenv('FLASK_ENV', 'production'))
+    if bind is None:
+        bind = (f'{config.HOST}:{config.PORT}' if service == 'nexus'
+                else f'{config.BACKEND_HOST}:{config.BACKEND_PORT}')
+    run(service, bind, gunicorn_options(config, bind, **overrides))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Invite expiry sweep: what it deactivates, batching, the CLI and the worker lock."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from models import InviteCode, User, db
+from models.database import record_queries
+from utils import invite_sweeper as sweeper_module
+from utils.invite_sweeper import InviteSweeper, sweep_invites
+
+NOW = datetime(2030, 1, 1)
+
+
+@pytest.fixture
+def manager(app):
+    manager = User(email='sweep-manager@example.com', role='manager', password_hash='x')
+    db.session.add(manager)
+    db.session.commit()
+    return manager
+
+
+def add_codes(manager, count, prefix, **fields):
+    db.session.add_all(
+        InviteCode(code=f'{prefix}{i:04d}', manager_id=manager.id, **fields) for i in range(count)
+    )
+    db.session.commit()
+
+
+def active_codes():
+    db.session.expire_all()
+    return {invite.code for invite in InviteCode.query.filter_by(is_active=True)}
+
+
+def test_deactivates_expired_and_used_up_codes(manager):
+    add_codes(manager, 1, 'EXPIRED', expires_at=NOW - timedelta(seconds=1))
+    add_codes(manager, 1, 'EXPIRING', expires_at=NOW)
+    add_codes(manager, 1, 'USEDUP', max_uses=3, used_count=3)
+    add_codes(manager, 1, 'FUTURE', expires_at=NOW + timedelta(days=1))
+    add_codes(manager, 1, 'PARTLY', max_uses=3, used_count=2)
+    add_codes(manager, 1, 'UNLIMITED', max_uses=0, used_count=50)
+    add_codes(manager, 1, 'NOEXPIRY')
+    
+    assert sweep_invites(now=NOW) == 3
+    
+    assert active_codes() == {'FUTURE0000', 'PARTLY0000', 'UNLIMITED0000', 'NOEXPIRY0000'}
+    assert sweep_invites(now=NOW) == 0
+
+
+def test_sweeps_in_batches(manager):
+    add_codes(manager, 25, 'OLD', expires_at=NOW - timedelta(days=1))
+    add_codes(manager, 5, 'NEW', expires_at=NOW + timedelta(days=1))
+    
+    with record_queries() as log:
+        assert sweep_invites(batch_size=10, now=NOW) == 25
+    
+    updates = [s for s in log.statements if s.lstrip().upper().startswith('UPDATE')]
+    assert len(updates) == 3
+    assert len(active_codes()) == 5
+
+
+def test_cli_command(app, manager):
+    add_codes(manager, 4, 'CLI', expires_at=datetime.utcnow() - timedelta(days=1))
+    
+    result = app.test_cli_runner().invoke(args=['sweep-invites', '--batch-size', '3'])
+    
+    assert result.exit_code == 0
+    assert 'Deactivated 4 invite codes' in result.output
+    assert active_codes() == set()
+
+
+def test_only_the_lock_holder_sweeps(app, tmp_path, monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(sweeper_module, 'sweep_invites',
+                        lambda batch_size: sweeps.append(threading.get_ident()) or 0)
+    app.config['INVITE_SWEEP_INTERVAL'] = 0.01
+    lock_path = str(tmp_path / 'sweep.lock')
+    
+    first, second = InviteSweeper(app), InviteSweeper(app)
+    first.start(lock_path)
+    time.sleep(0.1)
+    second.start(lock_path)
+    time.sleep(0.1)
+    
+    try:
+        assert set(sweeps) == {first._thread.ident}
+        
+        # The holder exits; the other takes over on its next try
+        second_thread = second._thread.ident
+        first.stop()
+        sweeps.clear()
+        time.sleep(0.1)
+        assert set(sweeps) == {second_thread}
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_disabled_without_interval(app):
+    sweeper = InviteSweeper(app)
+    sweeper.start()
+    
+    assert sweeper.interval == 0
+    assert sweeper._thread is None
@@ -0,0 +1,63 @@
+"""Invite redemption under concurrent requests."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from config.config import TestingConfig
+from models import InviteCode, User, db
+
+REDEMPTIONS = 50
+WORKERS = 16
+
+
+@pytest.fixture
+def threaded_app(tmp_path, monkeypatch):
+    """
+    An app whose request threads each get their own connection.
+    
+    The in-memory database shares one connection between threads, so this
+    uses a SQLite file; SQLite serializes writers, so set TEST_DATABASE_URL
+    to a local Postgres to exercise real row contention.
+    """
+    if not os.getenv('TEST_DATABASE_URL'):
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI',
+                            'sqlite:///' + str(tmp_path / 'invites.db'))
+    
+    from app import create_app
+    
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.parametrize('max_uses', [1, 10, 0])
+def test_concurrent_redemptions_never_oversell(threaded_app, max_uses):
+    app = threaded_app
+    headers = {'X-Internal-Key': app.config['INTERNAL_API_KEY']}
+    code = f'RACE{max_uses}'
+    
+    manager = User(email=f'race-{max_uses}@example.com', role='manager', password_hash='x')
+    db.session.add(manager)
+    db.session.flush()
+    db.session.add(InviteCode(code=code, manager_id=manager.id, max_uses=max_uses))
+    db.session.commit()
+    
+    def redeem(_):
+        with app.app_context(), app.test_client() as client:
+            return client.post(f'/invites/{code}/use', json={}, headers=headers).status_code
+    
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        statuses = list(pool.map(redeem, range(REDEMPTIONS)))
+    
+    db.session.expire_all()
+    invite = InviteCode.query.filter_by(code=code).one()
+    expected = max_uses or REDEMPTIONS
+    
+    assert statuses.count(200) == expected
+    assert set(statuses) <= {200, 400}
+    assert invite.used_count == expected
+    assert invite.is_active is (max_uses == 0)
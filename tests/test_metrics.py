@@ -0,0 +1,144 @@
+"""/metrics: access control, exposition format and per-request SQL counts."""
+
+import re
+
+import pytest
+from models import User, db
+from utils.metrics import Metrics, metrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+def parse(text):
+    """
+    Parse the text exposition format strictly.
+    
+    Returns:
+        tuple: ({family: type}, [(name, {label: value}, float)])
+    """
+    types, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, family, kind = line.split(' ')
+            types[family] = kind
+            continue
+        if line.startswith('#'):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f'unparsable line: {line!r}'
+        name, raw_labels, value = match.groups()
+        labels = {}
+        if raw_labels:
+            pairs = LABEL.findall(raw_labels)
+            assert ','.join(f'{k}="{v}"' for k, v in pairs) == raw_labels, f'bad labels: {line!r}'
+            labels = {k: re.sub(r'\\(.)', lambda m: {'n': '\n'}.get(m.group(1), m.group(1)), v)
+                      for k, v in pairs}
+        samples.append((name, labels, float(value)))
+    return types, samples
+
+
+def histograms(types, samples, family):
+    """{label set: (buckets [(le, count)], sum, count)} for one histogram family."""
+    assert types[family] == 'histogram'
+    series = {}
+    for name, labels, value in samples:
+        if not name.startswith(family + '_'):
+            continue
+        key = tuple(sorted((k, v) for k, v in labels.items() if k != 'le'))
+        buckets, total, count = series.get(key, ([], None, None))
+        suffix = name[len(family) + 1:]
+        if suffix == 'bucket':
+            buckets.append((float(labels['le']), value))
+        elif suffix == 'sum':
+            total = value
+        elif suffix == 'count':
+            count = value
+        series[key] = (buckets, total, count)
+    return series
+
+
+def scrape(client, headers):
+    response = client.get('/metrics', headers=headers)
+    assert response.status_code == 200
+    return parse(response.get_data(as_text=True))
+
+
+def statements(client, headers, endpoint):
+    """(sum, count) of statements per request for ``endpoint``; (0, 0) if never seen."""
+    types, samples = scrape(client, headers)
+    series = histograms(types, samples, 'nexus_sql_statements_per_request')
+    _, total, count = series.get((('endpoint', endpoint),), (None, 0, 0))
+    return total, count
+
+
+@pytest.mark.parametrize('key, status', [(None, 401), ('wrong-key', 403)])
+def test_requires_the_api_key(client, key, status):
+    response = client.get('/metrics', headers={'X-Internal-Key': key} if key else {})
+    
+    assert response.status_code == status
+    assert b'nexus_' not in response.get_data()
+
+
+def test_exposition_parses(client, headers):
+    client.get('/users/', headers=headers)
+    client.get('/users/999', headers=headers)
+    
+    response = client.get('/metrics', headers=headers)
+    assert response.mimetype == 'text/plain'
+    assert 'version=0.0.4' in response.headers['Content-Type']
+    types, samples = parse(response.get_data(as_text=True))
+    
+    assert {name for name, _, _ in samples} >= {'nexus_http_requests_total', 'nexus_http_requests_in_flight',
+                                                'nexus_db_pool_checked_out', 'nexus_db_pool_overflow'}
+    requests = {(labels['endpoint'], labels['status']): value
+                for name, labels, value in samples if name == 'nexus_http_requests_total'}
+    assert requests[('users.get_all_users', '200')] >= 1
+    assert requests[('users.get_user', '404')] >= 1
+    
+    for family, kind in types.items():
+        if kind != 'histogram':
+            continue
+        for labels, (buckets, total, count) in histograms(types, samples, family).items():
+            bounds = [le for le, _ in buckets]
+            counts = [value for _, value in buckets]
+            assert bounds == sorted(bounds) and bounds[-1] == float('inf'), family
+            assert counts == sorted(counts), f'{family}{labels}: buckets not cumulative'
+            assert counts[-1] == count and total is not None, family
+
+
+def test_pool_events_are_recorded(client, headers):
+    client.get('/users/', headers=headers)
+    
+    types, samples = scrape(client, headers)
+    _, _, held = histograms(types, samples, 'nexus_db_pool_checkout_held_seconds')[()]
+    _, _, opened = histograms(types, samples, 'nexus_db_pool_connect_seconds')[()]
+    assert held >= 1
+    assert opened >= 1
+
+
+def test_label_values_are_escaped():
+    registry = Metrics()
+    endpoint = 'odd "end\\point"\nname'
+    registry.requests[(endpoint, 'GET', 200)] = 3
+    
+    _, samples = parse(registry.render())
+    
+    assert ('nexus_http_requests_total', {'endpoint': endpoint, 'method': 'GET', 'status': '200'}, 3.0) in samples
+
+
+def test_query_count_resets_between_requests(client, headers):
+    db.session.add_all(User(email=f'metrics-{i}@example.com', role='employee', password_hash='x')
+                       for i in range(3))
+    db.session.commit()
+    
+    client.get('/users/', headers=headers)
+    assert statements(client, headers, 'users.get_all_users')[0] >= 1
+    
+    # Statements outside a request are not counted, and '/' runs none
+    User.query.all()
+    assert metrics._local.sql_count is None
+    before_total, before_count = statements(client, headers, 'index')
+    client.get('/')
+    
+    assert statements(client, headers, 'index') == (before_total, before_count + 1)
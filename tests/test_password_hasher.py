@@ -0,0 +1,90 @@
+"""Process-pool password hashing: slots, queue accounting and the 503 mapping."""
+
+import threading
+import time
+
+import pytest
+from models import User, db
+from utils.password_hasher import HashQueueFull, password_hasher
+
+
+@pytest.fixture
+def pooled_hasher(app):
+    """One worker process and one slot; callers give up after 50 ms."""
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=1, PASSWORD_HASH_TIMEOUT=0.05)
+    password_hasher.init_app(app)
+    yield password_hasher
+    password_hasher.shutdown()
+    app.config.update(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_QUEUE_SIZE=None, PASSWORD_HASH_TIMEOUT=5)
+    password_hasher.init_app(app)
+
+
+@pytest.fixture
+def saturated(pooled_hasher):
+    """Hold the only slot, as a long-running hash would."""
+    pooled_hasher._slots.acquire()
+    yield pooled_hasher
+    pooled_hasher._slots.release()
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_hashes_in_worker_process(pooled_hasher):
+    pwhash = pooled_hasher.hash('Password123')
+    
+    assert pooled_hasher.check(pwhash, 'Password123')
+    assert not pooled_hasher.check(pwhash, 'wrong-password1')
+    assert pooled_hasher._pool is not None
+    assert pooled_hasher.stats()['hashes_total'] >= 3
+
+
+def test_saturated_slots_raise_after_timeout(saturated):
+    started = time.perf_counter()
+    with pytest.raises(HashQueueFull):
+        saturated.hash('Password123')
+    
+    assert time.perf_counter() - started >= 0.05
+    stats = saturated.stats()
+    assert stats['rejected_total'] == 1
+    assert stats['queue_depth'] == stats['waiting'] == 0
+
+
+def test_callers_blocked_on_a_slot_are_counted(saturated):
+    saturated.timeout = 5
+    result = {}
+    caller = threading.Thread(target=lambda: result.update(pwhash=saturated.hash('Password123')))
+    caller.start()
+    
+    wait_for(lambda: saturated.stats()['waiting'] == 1)
+    assert saturated.stats()['queue_depth'] == 1
+    
+    saturated._slots.release()
+    caller.join(timeout=10)
+    saturated._slots.acquire()
+    
+    assert result['pwhash'].startswith('pbkdf2:sha256')
+    assert saturated.stats()['waiting'] == saturated.stats()['queue_depth'] == 0
+
+
+def test_create_user_returns_503_when_saturated(client, headers, saturated):
+    response = client.post('/users/', json={'email': 'busy@example.com', 'password': 'Password123'},
+                           headers=headers)
+    
+    assert response.status_code == 503
+    assert User.query.filter_by(email='busy@example.com').first() is None
+
+
+def test_update_user_returns_503_when_saturated(client, headers, saturated):
+    user = User(email='busy@example.com', role='employee', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    
+    response = client.put(f'/users/{user.id}', json={'password': 'Password123'}, headers=headers)
+    
+    assert response.status_code == 503
+    assert db.session.get(User, user.id).password_hash == 'x'
@@ -0,0 +1,92 @@
+"""SQL budgets per endpoint; a lazy load per row (N+1) fails the test."""
+
+import pytest
+from models import InviteCode, User, db
+
+
+@pytest.fixture
+def org(app):
+    """HR at the top, 3 managers, 30 employees and 20 invite codes."""
+    hr = User(email='hr@example.com', role='hr', password_hash='x')
+    db.session.add(hr)
+    db.session.flush()
+    
+    managers = [User(email=f'manager-{i}@example.com', role='manager', manager_id=hr.id,
+                     password_hash='x') for i in range(3)]
+    db.session.add_all(managers)
+    db.session.flush()
+    
+    employees = [User(email=f'employee-{i}@example.com', role='employee',
+                      manager_id=managers[i % 3].id, password_hash='x') for i in range(30)]
+    db.session.add_all(employees)
+    db.session.add_all(
+        InviteCode(code=f'BUDGET{i:04d}', manager_id=managers[i % 3].id) for i in range(20)
+    )
+    db.session.commit()
+    
+    ids = {'hr': hr.id, 'manager': managers[0].id, 'employee': employees[0].id}
+    # Start every request with an empty identity map, as a real request does
+    db.session.remove()
+    return ids
+
+
+@pytest.mark.parametrize('url, budget', [
+    ('/users/', 2),
+    ('/users/?role=employee&limit=10', 2),
+    ('/users/?fields=id,email&limit=10&after=5', 2),
+    ('/invites/', 2),
+    ('/invites/?active=true&limit=5', 2),
+])
+def test_list_endpoints(client, headers, org, query_budget, url, budget):
+    with query_budget(budget):
+        assert client.get(url, headers=headers).status_code == 200
+
+
+def test_invites_by_manager(client, headers, org, query_budget):
+    with query_budget(2):
+        response = client.get(f"/invites/?manager_id={org['manager']}", headers=headers)
+    
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 7
+
+
+def test_user_detail(client, headers, org, query_budget):
+    with query_budget(2):
+        assert client.get(f"/users/{org['employee']}", headers=headers).status_code == 200
+    
+    with query_budget(2):
+        assert client.get('/users/by-email/manager-0@example.com', headers=headers).status_code == 200
+
+
+def test_invite_detail(client, headers, org, query_budget):
+    with query_budget(2):
+        response = client.get('/invites/BUDGET0001?active=true', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['data']['manager_name']
+
+
+def test_revalidation_costs_one_query(client, headers, org, query_budget):
+    url = f"/users/{org['employee']}"
+    etag = client.get(url, headers=headers).headers['ETag']
+    
+    with query_budget(1):
+        response = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+    
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('query, budget', [('', 3), ('?depth=2', 2)])
+def test_reports(client, headers, org, query_budget, query, budget):
+    with query_budget(budget):
+        response = client.get(f"/users/{org['hr']}/reports{query}", headers=headers)
+    
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 33
+
+
+def test_chain(client, headers, org, query_budget):
+    with query_budget(2):
+        response = client.get(f"/users/{org['employee']}/chain", headers=headers)
+    
+    assert [user['level'] for user in response.get_json()['data']] == [1, 2]
@@ -0,0 +1,160 @@
+"""
+Hot routes must not scan a table.
+
+Calls each hot route through the test client, records the statements it
+actually executes (record_queries) and runs EXPLAIN on every SELECT with
+the parameters it was sent with. Any sequential scan of a table fails the
+test, so a missing or unusable index - or a route change that stops using
+one - breaks CI instead of production.
+
+TestingConfig uses SQLite. Point TEST_DATABASE_URL at a local Postgres to
+check the real planner; there, sequential scans are disabled for the
+session so small tables do not hide a missing index.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from models import db, User, InviteCode
+from models.database import record_queries
+
+# SQLite: "SCAN users" is a full table scan; "SCAN users USING INDEX ..."
+# is an index walk and "SCAN reports" reads a CTE, not a table
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+TABLES = (User.__tablename__, InviteCode.__tablename__)
+
+
+def seed():
+    """
+    A small org with invite codes, so every route runs its full query path.
+    
+    Returns:
+        dict: ids, email and code the hot routes are called with
+    """
+    hr = User(email='plan-hr@example.com', role='hr', password_hash='x')
+    db.session.add(hr)
+    db.session.flush()
+    
+    managers = [User(email=f'plan-manager-{i}@example.com', role='manager',
+                     manager_id=hr.id, password_hash='x') for i in range(3)]
+    db.session.add_all(managers)
+    db.session.flush()
+    
+    db.session.add_all(
+        User(email=f'plan-employee-{i}@example.com', role='employee', department='Engineering',
+             manager_id=managers[i % 3].id, password_hash='x')
+        for i in range(30)
+    )
+    db.session.add_all(
+        InviteCode(code=f'PLAN{i:06d}', manager_id=managers[i % 3].id,
+                   expires_at=datetime.utcnow() + timedelta(days=1 if i % 2 else -1))
+        for i in range(20)
+    )
+    db.session.commit()
+    
+    return {
+        'hr': hr.id,
+        'manager': managers[0].id,
+        'email': managers[0].email,
+        'code': 'PLAN000001',
+    }
+
+
+def hot_routes(ids):
+    """(route, URL, dialects or None for all) for each hot route."""
+    return [
+        ('GET /users/by-email/<email>', f"/users/by-email/{ids['email']}", None),
+        ('GET /users/<id>', f"/users/{ids['manager']}", None),
+        ('GET /users/?role=&limit=&after=', f"/users/?role=employee&limit=10&after={ids['manager']}", None),
+        ('GET /users/?role=&fields=', '/users/?role=manager&fields=id,email&limit=10', None),
+        ('GET /users/<id>/reports?depth= (CTE)', f"/users/{ids['hr']}/reports?depth=2", None),
+        # SQLite only uses an index for LIKE with case_sensitive_like on
+        ('GET /users/<id>/reports (org_path)', f"/users/{ids['hr']}/reports", ('postgresql',)),
+        ('GET /users/<id>/chain', f"/users/{ids['manager']}/chain", None),
+        ('GET /invites/<code>?active=true', f"/invites/{ids['code']}?active=true", None),
+        ('GET /invites/?manager_id=&active=', f"/invites/?manager_id={ids['manager']}&active=true&limit=10", None),
+    ]
+
+
+def capture(client, url, headers):
+    """(statement, parameters) for every SELECT a GET of ``url`` executes."""
+    with record_queries() as log:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, f'{url} returned {response.status_code}'
+    return [
+        (statement, parameters)
+        for statement, parameters in zip(log.statements, log.parameters)
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+    ]
+
+
+def capture_sweep():
+    from utils.invite_sweeper import sweep_invites
+    
+    with record_queries() as log:
+        sweep_invites()
+    return [
+        (statement, parameters)
+        for statement, parameters in zip(log.statements, log.parameters)
+        if statement.lstrip().upper().startswith('SELECT')
+    ]
+
+
+def explain(statement, parameters):
+    """Return the plan lines for a recorded statement on the current engine."""
+    connection = db.session.connection()
+    
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SET LOCAL enable_seqscan = off'))
+        return [row[0] for row in connection.exec_driver_sql('EXPLAIN ' + statement, parameters)]
+    
+    # SQLite: (id, parent, notused, detail)
+    return [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+
+
+def is_sequential_scan(line, dialect_name):
+    if dialect_name == 'postgresql':
+        return 'Seq Scan' in line
+    match = _SQLITE_SCAN.match(line.strip())
+    return bool(match) and match.group(1).rstrip('_0123456789') in TABLES
+
+
+def check_query_plans(app):
+    """
+    Call every hot route and EXPLAIN what it ran.
+    
+    Returns:
+        list: (route, statement, plan lines) for every statement that scans a table
+    """
+    ids = seed()
+    client = app.test_client()
+    headers = {'X-Internal-Key': app.config['INTERNAL_API_KEY']}
+    dialect_name = db.engine.dialect.name
+    
+    captured = [
+        (route, capture(client, url, headers))
+        for route, url, dialects in hot_routes(ids)
+        if not dialects or dialect_name in dialects
+    ]
+    captured.append(('invite expiry sweep', capture_sweep()))
+    
+    failures = []
+    for route, statements in captured:
+        for statement, parameters in statements:
+            plan = explain(statement, parameters)
+            if any(is_sequential_scan(line, dialect_name) for line in plan):
+                failures.append((route, statement, plan))
+    
+    db.session.rollback()
+    return failures
+
+
+def test_hot_routes_use_indexes(app):
+    failures = check_query_plans(app)
+    
+    assert not failures, '\n\n'.join(
+        f"{route}: {' '.join(statement.split())}\n" + '\n'.join(plan)
+        for route, statement, plan in failures
+    )
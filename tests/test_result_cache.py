@@ -0,0 +1,156 @@
+"""List endpoint result cache: commit-time invalidation, races and ETags."""
+
+import fnmatch
+
+import pytest
+from flask import jsonify
+from models import InviteCode, User, db
+from utils.result_cache import LocalBackend, RedisBackend, result_cache
+
+
+class FakeRedis:
+    """The slice of redis-py RedisBackend uses, in a dict (expiry is ignored)."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+    
+    def scan_iter(self, match='*'):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+@pytest.fixture(params=['local', 'redis'])
+def cache(request, app):
+    if request.param == 'local':
+        result_cache.backend = LocalBackend(max_size=64, ttl=60)
+    else:
+        result_cache.backend = RedisBackend(FakeRedis(), ttl=60)
+    result_cache.hits = result_cache.misses = result_cache.errors = 0
+    yield result_cache
+    result_cache.init_app(app)
+
+
+@pytest.fixture
+def manager(app):
+    manager = User(email='cache-manager@example.com', role='manager', password_hash='x')
+    db.session.add(manager)
+    db.session.flush()
+    db.session.add(InviteCode(code='CACHE0001', manager_id=manager.id))
+    db.session.commit()
+    return manager.id
+
+
+def generations(cache):
+    return {namespace: cache.backend.generation(namespace) for namespace in ('users', 'invites')}
+
+
+def emails(response):
+    return sorted(user['email'] for user in response.get_json()['data'])
+
+
+def test_repeat_reads_are_hits(client, headers, cache, manager):
+    first = client.get('/users/', headers=headers)
+    second = client.get('/users/', headers=headers)
+    
+    assert second.get_data() == first.get_data()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_commit_evicts_users_and_invites(client, headers, cache, manager):
+    client.get('/users/', headers=headers)
+    client.get('/invites/', headers=headers)
+    before = generations(cache)
+    
+    db.session.add(User(email='cache-new@example.com', role='employee', password_hash='x'))
+    db.session.commit()
+    
+    assert generations(cache) == {'users': before['users'] + 1, 'invites': before['invites'] + 1}
+    assert 'cache-new@example.com' in emails(client.get('/users/', headers=headers))
+    client.get('/invites/', headers=headers)
+    assert (cache.hits, cache.misses) == (0, 4)
+
+
+def test_invite_commit_keeps_user_listings(client, headers, cache, manager):
+    client.get('/users/', headers=headers)
+    
+    db.session.add(InviteCode(code='CACHE0002', manager_id=manager))
+    db.session.commit()
+    
+    client.get('/users/', headers=headers)
+    assert cache.hits == 1
+    assert len(client.get('/invites/', headers=headers).get_json()['data']) == 2
+
+
+def test_bulk_update_evicts(client, headers, cache, manager):
+    client.get('/invites/?active=true', headers=headers)
+    
+    InviteCode.query.update({'is_active': False}, synchronize_session=False)
+    db.session.commit()
+    
+    assert client.get('/invites/?active=true', headers=headers).get_json()['data'] == []
+
+
+def test_rollback_keeps_the_cache(client, headers, cache, manager):
+    cached = client.get('/users/', headers=headers).get_data()
+    before = generations(cache)
+    
+    db.session.add(User(email='cache-rolled-back@example.com', role='employee', password_hash='x'))
+    db.session.flush()
+    db.session.rollback()
+    
+    assert generations(cache) == before
+    assert client.get('/users/', headers=headers).get_data() == cached
+    assert cache.hits == 1
+
+
+def test_read_racing_a_write_is_not_stored(app, cache, manager):
+    def stale_view():
+        # Read, then another request commits before the response is stored
+        payload = [user.email for user in User.query.all()]
+        db.session.add(User(email='cache-racer@example.com', role='employee', password_hash='x'))
+        db.session.commit()
+        return jsonify(data=payload)
+    
+    with app.test_request_context('/users/?race=1'):
+        stale = cache.cached('users', stale_view)
+    assert 'cache-racer@example.com' not in stale.get_json()['data']
+    
+    fresh_calls = []
+    def fresh_view():
+        fresh_calls.append(1)
+        return jsonify(data=[user.email for user in User.query.all()])
+    
+    with app.test_request_context('/users/?race=1'):
+        fresh = cache.cached('users', fresh_view)
+    
+    assert fresh_calls == [1]
+    assert 'cache-racer@example.com' in fresh.get_json()['data']
+    if isinstance(cache.backend, LocalBackend):
+        assert cache.backend.size() == 1
+
+
+def test_cached_view_answers_if_none_match(client, headers, cache, manager):
+    first = client.get('/users/', headers=headers)
+    etag = first.headers['ETag']
+    
+    revalidated = client.get('/users/', headers=dict(headers, **{'If-None-Match': etag}))
+    
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert cache.hits == 1
+    
+    db.session.add(User(email='cache-etag@example.com', role='employee', password_hash='x'))
+    db.session.commit()
+    
+    changed = client.get('/users/', headers=dict(headers, **{'If-None-Match': etag}))
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
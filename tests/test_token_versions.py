@@ -0,0 +1,65 @@
+"""Token version stamps: bumps on update and revoke, and the revalidated table."""
+
+import pytest
+from models import User, db
+
+
+@pytest.fixture
+def user(app):
+    user = User(email='stamp@example.com', role='employee', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.mark.parametrize('changes, bumped', [
+    ({'role': 'manager'}, True),
+    ({'email': 'stamp-new@example.com'}, True),
+    ({'role': 'employee', 'email': 'stamp@example.com'}, False),
+    ({'first_name': 'Ada', 'department': 'R&D'}, False),
+])
+def test_update_bumps_version_on_role_or_email_change(client, headers, user, changes, bumped):
+    response = client.put(f'/users/{user.id}', json=changes, headers=headers)
+    
+    assert response.status_code == 200
+    assert db.session.get(User, user.id).token_version == (1 if bumped else 0)
+
+
+def test_revoke_tokens_bumps_version(client, headers, user):
+    for expected in (1, 2):
+        response = client.post(f'/users/{user.id}/revoke-tokens', headers=headers)
+        
+        assert response.status_code == 200
+        assert response.get_json()['data'] == {'id': user.id, 'token_version': expected}
+    
+    assert client.post('/users/9999/revoke-tokens', headers=headers).status_code == 404
+    assert client.post(f'/users/{user.id}/revoke-tokens').status_code == 401
+
+
+def test_token_versions_lists_only_bumped_users(client, headers, user):
+    other = User(email='stamp-other@example.com', role='employee', password_hash='x')
+    db.session.add(other)
+    db.session.commit()
+    client.post(f'/users/{other.id}/revoke-tokens', headers=headers)
+    
+    response = client.get('/users/token-versions', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['data'] == {str(other.id): 1}
+    assert client.get('/users/token-versions').status_code == 401
+
+
+def test_token_versions_revalidates_with_etag(client, headers, user):
+    first = client.get('/users/token-versions', headers=headers)
+    etag = first.headers['ETag']
+    
+    cached = client.get('/users/token-versions', headers=dict(headers, **{'If-None-Match': etag}))
+    assert cached.status_code == 304
+    assert cached.get_data() == b''
+    assert cached.headers['ETag'] == etag
+    
+    client.post(f'/users/{user.id}/revoke-tokens', headers=headers)
+    changed = client.get('/users/token-versions', headers=dict(headers, **{'If-None-Match': etag}))
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['data'] == {str(user.id): 1}
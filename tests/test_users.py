@@ -0,0 +1,73 @@
+"""User routes: NDJSON export and bulk creation."""
+
+import json
+
+import pytest
+from models import User, db
+
+
+@pytest.fixture
+def users(app):
+    db.session.add_all(
+        User(email=f'export-{i}@example.com', role='manager' if i % 3 == 0 else 'employee',
+             password_hash='x') for i in range(7)
+    )
+    db.session.commit()
+
+
+def test_export_streams_one_json_object_per_line(client, headers, users):
+    response = client.get('/users/export', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    assert body.endswith('\n')
+    
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert all(isinstance(row, dict) for row in rows)
+    assert [row['email'] for row in rows] == [f'export-{i}@example.com' for i in range(7)]
+
+
+def test_export_filters_and_fields(client, headers, users):
+    response = client.get('/users/export?role=manager&fields=email', headers=headers)
+    
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [set(row) for row in rows] == [{'id', 'email'}] * 3
+
+
+@pytest.mark.parametrize('accept, status', [
+    ('application/x-ndjson', 200),
+    ('*/*', 200),
+    ('application/json;q=0.9, application/x-ndjson', 200),
+    ('application/json', 406),
+    ('text/csv', 406),
+])
+def test_export_negotiates_accept(client, headers, users, accept, status):
+    response = client.get('/users/export', headers=dict(headers, Accept=accept))
+    
+    assert response.status_code == status
+    if status == 406:
+        assert response.get_json()['status'] == 406
+
+
+def test_bulk_marks_malformed_rows_invalid(client, headers):
+    valid = {'email': 'bulk-ok@example.com', 'password': 'Password123'}
+    malformed = [
+        {'email': 42, 'password': 'Password123'},
+        {'email': ['a@example.com'], 'password': 'Password123'},
+        {'email': {'x': 1}, 'password': 'Password123'},
+        {'email': 'bulk-pw@example.com', 'password': 12345678},
+        {'email': 'bulk-name@example.com', 'password': 'Password123', 'first_name': ['x']},
+        {'email': 'bulk-manager@example.com', 'password': 'Password123', 'manager_id': '1'},
+        'not an object',
+    ]
+    payload = [valid] + malformed + [dict(valid, email='bulk-ok-2@example.com')]
+    
+    response = client.post('/users/bulk', json={'users': payload}, headers=headers)
+    
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['summary'] == {'created': 2, 'duplicate': 0, 'invalid': len(malformed)}
+    assert [row['status'] for row in body['data']] == ['created'] + ['invalid'] * len(malformed) + ['created']
+    assert body['data'][4]['message'] == 'Password must be a string'
+    assert User.query.filter(User.email.like('bulk-%')).count() == 2
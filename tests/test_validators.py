@@ -0,0 +1,57 @@
+"""Request payload parsing: parse_date."""
+
+from datetime import date, datetime
+
+import pytest
+from utils.validators import parse_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1990-01-31', date(1990, 1, 31)),
+    ('2000-02-29', date(2000, 2, 29)),
+    (date(1990, 1, 31), date(1990, 1, 31)),
+    (datetime(1990, 1, 31, 23, 59), date(1990, 1, 31)),
+    (None, None),
+    ('', None),
+])
+def test_parse_date_accepts(value, expected):
+    parsed, error = parse_date(value)
+    
+    assert error is None
+    assert parsed == expected
+    assert parsed is None or type(parsed) is date
+
+
+@pytest.mark.parametrize('value', [
+    '1990-01-01garbage',
+    '1990-01-01T99:99',
+    '1990-01-01T00:00:00',
+    '1990-01-01 ',
+    ' 1990-01-01',
+    '19900101',
+    '1990-W01-1',
+    '1990-1-1',
+    '1990-02-30',
+    '2001-02-29',
+    '1990-13-01',
+    '١٩٩٠-٠١-٠١',
+    'not a date',
+    19900101,
+    1990.0,
+    True,
+    ['1990-01-01'],
+    {'date': '1990-01-01'},
+])
+def test_parse_date_rejects(value):
+    parsed, error = parse_date(value)
+    
+    assert parsed is None
+    assert error == 'date_of_birth must be an ISO date (YYYY-MM-DD)'
+
+
+def test_create_user_rejects_trailing_text(client, headers):
+    response = client.post('/users/', json={'email': 'dob@example.com', 'password': 'Password123',
+                                            'date_of_birth': '1990-01-01garbage'}, headers=headers)
+    
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'date_of_birth must be an ISO date (YYYY-MM-DD)'
@@ -1,6 +1,6 @@
 """Utility functions and helpers."""
 
 from utils.validators import validate_email, validate_password
-from utils.decorators import role_required, get_current_user_id
+from utils.decorators import require_api_key
 
-__all__ = ['validate_email', 'validate_password', 'role_required', 'get_current_user_id']
+__all__ = ['validate_email', 'validate_password', 'require_api_key']
@@ -0,0 +1,43 @@
+"""Conditional GET support: weak ETags and 304 Not Modified responses."""
+
+import hashlib
+from flask import make_response, request
+
+
+def compute_etag(*version):
+    """
+    Build an ETag value from a resource version.
+    
+    The request's query string is mixed in, so different projections or
+    pages of the same data never share a tag.
+    
+    Args:
+        *version: Cheap version markers (ids, updated_at, counts...)
+        
+    Returns:
+        str: Opaque tag, to be sent as a weak ETag
+    """
+    return hashlib.sha1(repr((version, request.query_string)).encode()).hexdigest()
+
+
+def conditional_response(etag, build):
+    """
+    Answer 304 if the client already holds ``etag``, else call ``build``.
+    
+    Args:
+        etag (str): Current tag of the resource
+        build (callable): Returns the full response (any Flask return value);
+            only called when the client copy is stale
+            
+    Returns:
+        Response: 304 without body, or the built response with its ETag set
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    
+    response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,133 @@
+"""Deactivation of expired and used-up invite codes."""
+
+import threading
+from datetime import datetime
+from models import InviteCode, db
+
+
+def sweep_invites(batch_size=1000, now=None):
+    """
+    Flip is_active off for codes that are expired or exhausted.
+
+    Works in batches of ``batch_size`` ids, one UPDATE and commit per batch,
+    so no single transaction locks the whole table.
+
+    Returns:
+        int: Number of codes deactivated
+    """
+    now = now or datetime.utcnow()
+    total = 0
+
+    while True:
+        ids = [
+            row.id for row in
+            db.session.query(InviteCode.id)
+            .filter(InviteCode.stale_clause(now))
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+
+        db.session.query(InviteCode).filter(InviteCode.id.in_(ids)).update(
+            {'is_active': False}, synchronize_session=False
+        )
+        db.session.commit()
+        total += len(ids)
+
+        if len(ids) < batch_size:
+            break
+
+    return total
+
+
+class InviteSweeper:
+    """
+    Optional in-process background thread running sweep_invites().
+
+    Follows the Flask extension pattern. Enabled when
+    INVITE_SWEEP_INTERVAL (seconds) is greater than zero; otherwise run
+    `flask sweep-invites` from cron.
+
+    init_app() only configures it; CLI commands never start the thread.
+    The development server (app.py, run.py) starts it in its serving
+    process. Under serve.py every Gunicorn worker starts it with a lock
+    file: only the worker holding the lock sweeps, the others retry each
+    interval and take over when that worker exits. The master never runs
+    it, so workers are not forked while it holds a connection.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.interval = 0
+        self.batch_size = 1000
+        self._thread = None
+        self._stop = threading.Event()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure from the application config; see start()."""
+        self.app = app
+        self.interval = app.config.get('INVITE_SWEEP_INTERVAL', 0)
+        self.batch_size = app.config.get('INVITE_SWEEP_BATCH_SIZE', 1000)
+
+        app.extensions['invite_sweeper'] = self
+
+    def start(self, lock_path=None):
+        """
+        Start the background thread if INVITE_SWEEP_INTERVAL > 0.
+
+        Args:
+            lock_path (str): Sweep only while holding an exclusive lock on
+                this file, so one of several processes sweeps at a time
+        """
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(lock_path,),
+                                        name='invite-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, lock_path):
+        lock = None
+        try:
+            while not self._stop.wait(self.interval):
+                if lock_path and lock is None:
+                    lock = _try_lock(lock_path)
+                    if lock is None:
+                        continue
+                with self.app.app_context():
+                    try:
+                        count = sweep_invites(self.batch_size)
+                        if count:
+                            self.app.logger.info('Invite sweeper deactivated %d codes', count)
+                    except Exception:
+                        db.session.rollback()
+                        self.app.logger.exception('Invite sweep failed')
+        finally:
+            # Closing the file releases the lock for the next process
+            if lock is not None:
+                lock.close()
+
+
+def _try_lock(path):
+    """Open ``path`` holding an exclusive lock, or return None if another process has it."""
+    import fcntl  # Unix only, like Gunicorn
+
+    lock = open(path, 'a')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+    return lock
+
+
+invite_sweeper = InviteSweeper()
@@ -0,0 +1,258 @@
+"""Request, SQL and connection-pool instrumentation in Prometheus text format."""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from flask import request
+from sqlalchemy import event
+from models.database import instrument_engine as record_statements
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _label(value):
+    """Escape a label value for the text exposition format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Cumulative-bucket histogram; callers hold the registry lock."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {self.count}')
+        labels = f'{{{labels.rstrip(",")}}}' if labels else ''
+        lines.append(f'{name}_sum{labels} {self.sum}')
+        lines.append(f'{name}_count{labels} {self.count}')
+        return lines
+
+
+class Metrics:
+    """
+    Built-in instrumentation exported at /metrics.
+
+    Follows the Flask extension pattern. Per request it records latency,
+    status and the SQL statements run in the request thread (via engine
+    cursor events). Pool events time new connections and how long each
+    checkout is held; checked-out and overflow gauges are read from the
+    pools at scrape time, so a pool running out shows there. Everything
+    is kept in plain dicts behind one lock, so the per-request cost stays
+    in the low microseconds. Disabled with METRICS_ENABLED=False.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.in_flight = 0
+        self.requests = {}        # (endpoint, method, status) -> count
+        self.latency = {}         # (endpoint, method) -> Histogram
+        self.statements = {}      # endpoint -> Histogram of statements per request
+        self.sql_seconds = {}     # endpoint -> total seconds in SQL
+        self.pool_connect = Histogram(POOL_BUCKETS)   # opening a new DBAPI connection
+        self.pool_hold = Histogram(POOL_BUCKETS)      # checkout to checkin
+        self._engines = weakref.WeakSet()
+
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        """Hook request lifecycle and the engines of ``db``."""
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        app.extensions['metrics'] = self
+
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument_engine(engine)
+
+    def instrument_engine(self, engine):
+        """Count statements per request and time pool connections."""
+        if getattr(engine, '_nexus_metrics', False):
+            return
+        engine._nexus_metrics = True
+
+        # Shares the statement recorder's before hook instead of adding a second one
+        record_statements(engine)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        # Pool listeners carry over to the new pool when the engine is disposed
+        event.listen(engine, 'do_connect', self._before_connect)
+        event.listen(engine, 'connect', self._after_connect)
+        event.listen(engine, 'checkout', self._checkout)
+        event.listen(engine, 'checkin', self._checkin)
+        self._engines.add(engine)
+
+    # Request lifecycle
+
+    def _before_request(self):
+        local = self._local
+        local.sql_count = 0
+        local.sql_seconds = 0.0
+        local.status = 500
+        local.start = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+
+    def _after_request(self, response):
+        self._local.status = response.status_code
+        return response
+
+    def _teardown_request(self, exc):
+        local = self._local
+        start = getattr(local, 'start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        req = request._get_current_object()
+        endpoint = req.endpoint or 'unmatched'
+        method = req.method
+        sql_count = local.sql_count
+        sql_seconds = local.sql_seconds
+        local.start = local.sql_count = None
+
+        with self._lock:
+            self.in_flight -= 1
+            key = (endpoint, method, local.status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            histogram = self.latency.get((endpoint, method))
+            if histogram is None:
+                histogram = self.latency[(endpoint, method)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(elapsed)
+
+            histogram = self.statements.get(endpoint)
+            if histogram is None:
+                histogram = self.statements[endpoint] = Histogram(STATEMENT_BUCKETS)
+            histogram.observe(sql_count)
+            self.sql_seconds[endpoint] = self.sql_seconds.get(endpoint, 0.0) + sql_seconds
+
+    # Engine events
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        local = self._local
+        if getattr(local, 'sql_count', None) is not None:
+            elapsed = time.perf_counter() - conn.info['query_start']
+            local.sql_count += 1
+            local.sql_seconds += elapsed
+
+    # Pool events
+
+    def _before_connect(self, dialect, connection_record, cargs, cparams):
+        connection_record.info['connect_start'] = time.perf_counter()
+
+    def _after_connect(self, dbapi_connection, connection_record):
+        start = connection_record.info.pop('connect_start', None)
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.pool_connect.observe(elapsed)
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checkout_start'] = time.perf_counter()
+
+    def _checkin(self, dbapi_connection, connection_record):
+        start = connection_record.info.pop('checkout_start', None)
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.pool_hold.observe(elapsed)
+
+    def _pool_gauges(self):
+        checked_out = overflow = 0
+        for engine in list(self._engines):
+            pool = engine.pool
+            checked_out += pool.checkedout() if hasattr(pool, 'checkedout') else 0
+            overflow += max(pool.overflow(), 0) if hasattr(pool, 'overflow') else 0
+        return checked_out, overflow
+
+    # Export
+
+    def render(self):
+        """Prometheus text exposition (format 0.0.4)."""
+        lines = [
+            '# HELP nexus_http_requests_total Requests handled, by endpoint, method and status.',
+            '# TYPE nexus_http_requests_total counter',
+        ]
+        with self._lock:
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'nexus_http_requests_total{{endpoint="{_label(endpoint)}",method="{_label(method)}",'
+                    f'status="{status}"}} {count}'
+                )
+
+            lines += [
+                '# HELP nexus_http_request_duration_seconds Request latency.',
+                '# TYPE nexus_http_request_duration_seconds histogram',
+            ]
+            for (endpoint, method), histogram in sorted(self.latency.items()):
+                lines += histogram.render(
+                    'nexus_http_request_duration_seconds', f'endpoint="{_label(endpoint)}",method="{_label(method)}",'
+                )
+
+            lines += [
+                '# HELP nexus_http_requests_in_flight Requests currently being served.',
+                '# TYPE nexus_http_requests_in_flight gauge',
+                f'nexus_http_requests_in_flight {self.in_flight}',
+                '# HELP nexus_sql_statements_per_request SQL statements executed per request.',
+                '# TYPE nexus_sql_statements_per_request histogram',
+            ]
+            for endpoint, histogram in sorted(self.statements.items()):
+                lines += histogram.render('nexus_sql_statements_per_request', f'endpoint="{_label(endpoint)}",')
+
+            lines += [
+                '# HELP nexus_sql_duration_seconds_total Time spent executing SQL, by endpoint.',
+                '# TYPE nexus_sql_duration_seconds_total counter',
+            ]
+            for endpoint, seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'nexus_sql_duration_seconds_total{{endpoint="{_label(endpoint)}"}} {seconds}')
+
+            lines += [
+                '# HELP nexus_db_pool_connect_seconds Time to open a new database connection.',
+                '# TYPE nexus_db_pool_connect_seconds histogram',
+            ]
+            lines += self.pool_connect.render('nexus_db_pool_connect_seconds', '')
+            lines += [
+                '# HELP nexus_db_pool_checkout_held_seconds Time a pooled connection stays checked out.',
+                '# TYPE nexus_db_pool_checkout_held_seconds histogram',
+            ]
+            lines += self.pool_hold.render('nexus_db_pool_checkout_held_seconds', '')
+
+        checked_out, overflow = self._pool_gauges()
+        lines += [
+            '# HELP nexus_db_pool_checked_out Connections currently checked out.',
+            '# TYPE nexus_db_pool_checked_out gauge',
+            f'nexus_db_pool_checked_out {checked_out}',
+            '# HELP nexus_db_pool_overflow Connections open beyond pool_size.',
+            '# TYPE nexus_db_pool_overflow gauge',
+            f'nexus_db_pool_overflow {overflow}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -0,0 +1,136 @@
+"""Password hashing service backed by a process pool."""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashQueueFull(RuntimeError):
+    """Raised when the hashing queue stays saturated past the wait timeout."""
+
+
+def _generate(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _check(pwhash, password):
+    return check_password_hash(pwhash, password)
+
+
+class PasswordHasher:
+    """
+    Runs pbkdf2 hashing/verification outside the request thread.
+
+    Work is submitted to a process pool so CPU-heavy hashing neither holds
+    the GIL of the web worker nor starves cheap reads. The number of jobs
+    queued or running is bounded; callers wait up to PASSWORD_HASH_TIMEOUT
+    seconds for a slot and then get HashQueueFull.
+
+    Follows the Flask extension pattern: create once, call init_app().
+    With PASSWORD_HASH_WORKERS = 0 hashing runs inline in the caller.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'pbkdf2:sha256'
+        self.workers = 0
+        self.queue_size = 0
+        self.timeout = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'queue_depth': 0,  # waiting for a slot or hashing
+            'waiting': 0,      # blocked on a slot
+            'hashes_total': 0,
+            'hash_seconds_total': 0.0,
+            'hash_seconds_max': 0.0,
+            'rejected_total': 0,
+        }
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the hasher from the application config."""
+        iterations = app.config.get('PASSWORD_HASH_ITERATIONS')
+        self.method = f'pbkdf2:sha256:{iterations}' if iterations else 'pbkdf2:sha256'
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE') or max(self.workers, 1) * 4
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 5)
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+
+        app.extensions['password_hasher'] = self
+
+    def hash(self, password):
+        """Return a salted pbkdf2 hash for the password."""
+        return self._run(_generate, password, self.method)
+
+    def check(self, pwhash, password):
+        """Verify a password against a stored hash."""
+        return self._run(_check, pwhash, password)
+
+    def stats(self):
+        """Return queue depth and latency counters."""
+        with self._stats_lock:
+            data = dict(self._stats)
+        data['hash_seconds_avg'] = (
+            data['hash_seconds_total'] / data['hashes_total'] if data['hashes_total'] else 0.0
+        )
+        data['queue_capacity'] = self.queue_size
+        return data
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _run(self, fn, *args):
+        # Counted before acquiring a slot: blocked callers are the real queue
+        with self._stats_lock:
+            self._stats['queue_depth'] += 1
+        try:
+            if not self.workers:
+                return self._timed(fn, *args)
+
+            with self._stats_lock:
+                self._stats['waiting'] += 1
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._stats_lock:
+                self._stats['waiting'] -= 1
+                if not acquired:
+                    self._stats['rejected_total'] += 1
+            if not acquired:
+                raise HashQueueFull('Password hashing queue is full')
+
+            try:
+                return self._timed(lambda *a: self._get_pool().submit(fn, *a).result(), *args)
+            finally:
+                self._slots.release()
+        finally:
+            with self._stats_lock:
+                self._stats['queue_depth'] -= 1
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self._stats['hashes_total'] += 1
+                self._stats['hash_seconds_total'] += elapsed
+                self._stats['hash_seconds_max'] = max(self._stats['hash_seconds_max'], elapsed)
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+
+password_hasher = PasswordHasher()
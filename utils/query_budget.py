@@ -0,0 +1,43 @@
+"""
+pytest plugin asserting per-endpoint SQL query budgets.
+
+Enable it from a conftest.py::
+
+    pytest_plugins = ['utils.query_budget']
+
+and wrap the request under test::
+
+    def test_list_invites(client, headers, query_budget):
+        with query_budget(2):
+            client.get('/invites/', headers=headers)
+
+The block fails if it runs more than ``max_queries`` statements, or if one
+statement shape repeats ``N_PLUS_ONE_THRESHOLD`` times or more (a lazy
+load per row). Pass ``allow_repeats=True`` for intentional loops.
+"""
+
+from contextlib import contextmanager
+import pytest
+from models.database import N_PLUS_ONE_THRESHOLD, record_queries
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory: ``with query_budget(max_queries): ...``"""
+
+    @contextmanager
+    def budget(max_queries, allow_repeats=False, threshold=N_PLUS_ONE_THRESHOLD):
+        with record_queries() as log:
+            yield log
+
+        problems = []
+        if len(log) > max_queries:
+            problems.append(f'{len(log)} queries executed, budget is {max_queries}')
+        if not allow_repeats:
+            for shape, count in log.repeated(threshold):
+                problems.append(f'N+1: {count} x {shape}')
+
+        if problems:
+            pytest.fail('\n'.join(problems) + '\n\nStatements:\n' + log.report(), pytrace=False)
+
+    return budget
@@ -0,0 +1,291 @@
+"""Server-side cache of list endpoint responses."""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import InviteCode, User
+from utils.etag import conditional_response
+
+try:
+    import redis
+except ImportError:  # optional dependency, only needed for RESULT_CACHE_BACKEND=redis
+    redis = None
+
+
+# Cache namespaces touched by a change to each model. Invite listings embed
+# the manager's name, so user changes drop them too.
+NAMESPACES_BY_MODEL = {
+    User: ('users', 'invites'),
+    InviteCode: ('invites',),
+}
+
+
+class LocalBackend:
+    """
+    In-process LRU cache with a TTL.
+
+    Each namespace carries a generation number; invalidating bumps it and
+    drops the namespace's entries. A value computed under an older
+    generation is refused, so a slow reader cannot store pre-commit data.
+    """
+
+    name = 'local'
+
+    def __init__(self, max_size=512, ttl=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace):
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def get(self, namespace, generation, key):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires, entry_generation, value = entry
+            if expires < time.monotonic() or entry_generation != generation:
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace, generation, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker through a Redis-protocol server.
+
+    Generations live in Redis (``INCR``), so a commit in one worker
+    invalidates all of them. Superseded entries are never read again and
+    simply expire with the TTL. Any client exposing ``get``/``set``/
+    ``incr``/``scan_iter`` like redis-py works (fakeredis included).
+    """
+
+    name = 'redis'
+
+    def __init__(self, client, ttl=30, prefix='nexus:rc'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        if redis is None:
+            raise RuntimeError('RESULT_CACHE_BACKEND=redis requires the redis package')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _generation_key(self, namespace):
+        return f'{self.prefix}:gen:{namespace}'
+
+    def _entry_key(self, namespace, generation, key):
+        return f'{self.prefix}:entry:{namespace}:{generation}:{key}'
+
+    def generation(self, namespace):
+        return int(self.client.get(self._generation_key(namespace)) or 0)
+
+    def get(self, namespace, generation, key):
+        raw = self.client.get(self._entry_key(namespace, generation, key))
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b'\n')
+        return etag.decode() or None, body
+
+    def set(self, namespace, generation, key, value):
+        etag, body = value
+        self.client.set(
+            self._entry_key(namespace, generation, key),
+            (etag or '').encode() + b'\n' + body,
+            ex=max(int(self.ttl), 1)
+        )
+
+    def invalidate(self, namespace):
+        self.client.incr(self._generation_key(namespace))
+
+    def size(self):
+        # Includes superseded generations until their TTL runs out
+        return sum(1 for _ in self.client.scan_iter(match=f'{self.prefix}:entry:*'))
+
+
+class ResultCache:
+    """
+    Response cache for the list endpoints, keyed by path and query string.
+
+    Follows the Flask extension pattern. RESULT_CACHE_BACKEND selects
+    ``local`` (default), ``redis`` (RESULT_CACHE_REDIS_URL) or ``none``.
+    Entries are dropped from the session's after_commit hook whenever a
+    User or InviteCode was written in that transaction.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Build the configured backend."""
+        kind = app.config.get('RESULT_CACHE_BACKEND', 'local')
+        ttl = app.config.get('RESULT_CACHE_TTL', 30)
+
+        if kind == 'redis':
+            self.backend = RedisBackend.from_url(app.config['RESULT_CACHE_REDIS_URL'], ttl=ttl)
+        elif kind == 'local':
+            self.backend = LocalBackend(app.config.get('RESULT_CACHE_SIZE', 512), ttl)
+        else:
+            self.backend = None
+
+        app.extensions['result_cache'] = self
+
+    def cached(self, namespace, view):
+        """
+        Serve ``view()`` from the cache when possible.
+
+        Only 200 responses are stored, together with their ETag, so a hit
+        can still answer If-None-Match with 304.
+
+        Args:
+            namespace (str): 'users' or 'invites'; see NAMESPACES_BY_MODEL
+            view (callable): Builds the response on a miss
+        """
+        if self.backend is None:
+            return view()
+
+        key = request.full_path
+        try:
+            generation = self.backend.generation(namespace)
+            entry = self.backend.get(namespace, generation, key)
+        except Exception:
+            current_app.logger.exception('Result cache read failed')
+            self._count('errors')
+            return view()
+
+        if entry is not None:
+            self._count('hits')
+            etag, body = entry
+            build = lambda: current_app.response_class(body, mimetype='application/json')
+            if etag is None:
+                return build()
+            return conditional_response(etag, build)
+
+        self._count('misses')
+        response = current_app.make_response(view())
+
+        if response.status_code == 200:
+            etag, _ = response.get_etag()
+            try:
+                self.backend.set(namespace, generation, key, (etag, response.get_data()))
+            except Exception:
+                current_app.logger.exception('Result cache write failed')
+                self._count('errors')
+
+        return response
+
+    def cached_view(self, namespace):
+        """Decorator form of cached(); place it below require_api_key."""
+        def decorator(f):
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                return self.cached(namespace, lambda: f(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def invalidate(self, *namespaces):
+        if self.backend is None:
+            return
+        for namespace in namespaces:
+            try:
+                self.backend.invalidate(namespace)
+            except Exception:
+                current_app.logger.exception('Result cache invalidation failed')
+                self._count('errors')
+
+    def stats(self):
+        """Hit ratio and entry count, for /health and tuning."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'backend': self.backend.name if self.backend else 'none',
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        try:
+            stats['entries'] = self.backend.size() if self.backend else 0
+        except Exception:
+            stats['entries'] = None
+        return stats
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+result_cache = ResultCache()
+
+
+def _mark(session, model):
+    session.info.setdefault('result_cache_dirty', set()).update(NAMESPACES_BY_MODEL.get(model, ()))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _mark(session, type(obj))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_dml(orm_execute_state):
+    # UPDATE/DELETE statements never show up in session.dirty
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None:
+            for model in NAMESPACES_BY_MODEL:
+                _mark(orm_execute_state.session, model)
+        else:
+            _mark(orm_execute_state.session, mapper.class_)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    namespaces = session.info.pop('result_cache_dirty', None)
+    if namespaces:
+        result_cache.invalidate(*namespaces)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back(session):
+    session.info.pop('result_cache_dirty', None)
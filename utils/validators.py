@@ -1,6 +1,9 @@
 """Input validation utilities."""
 
 import re
+from datetime import date, datetime, timezone
+
+ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}', re.ASCII)
 
 
 def validate_email(email):
@@ -48,3 +51,59 @@ def validate_password(password):
         return False, 'Password must contain at least one number'
     
     return True, 'Valid password'
+
+
+def parse_date(value):
+    """
+    Parse an ISO date (YYYY-MM-DD) from a request payload.
+    
+    The whole string must be the date; trailing times or text are rejected
+    rather than truncated. A datetime is reduced to its date.
+    
+    Args:
+        value: String, date or None
+        
+    Returns:
+        tuple: (date or None, error message or None)
+    """
+    if value is None or value == '':
+        return None, None
+    if isinstance(value, datetime):
+        return value.date(), None
+    if isinstance(value, date):
+        return value, None
+    
+    error = 'date_of_birth must be an ISO date (YYYY-MM-DD)'
+    # fromisoformat also takes 19900101 and week dates; only the dashed form is documented
+    if not isinstance(value, str) or not ISO_DATE.fullmatch(value):
+        return None, error
+    
+    try:
+        return date.fromisoformat(value), None
+    except ValueError:
+        return None, error
+
+
+def parse_datetime(value, field='expires_at'):
+    """
+    Parse an ISO datetime from a request payload (a bare date means midnight).
+    
+    Args:
+        value: String, datetime or None
+        field (str): Field name used in the error message
+        
+    Returns:
+        tuple: (naive UTC datetime or None, error message or None)
+    """
+    if value is None or value == '' or isinstance(value, datetime):
+        return value or None, None
+    
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None, f'{field} must be an ISO datetime (YYYY-MM-DDTHH:MM:SS)'
+    
+    # Columns store naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed, None